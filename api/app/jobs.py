@@ -0,0 +1,204 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+_IN_FLIGHT = (QUEUED, RUNNING)
+
+# Recent finished jobs used for wait/run time statistics and Retry-After estimates.
+_STATS_WINDOW = 50
+
+# Settings that change what a kickoff produces, so they are part of its identity.
+_KEY_ENV_VARS = (
+    "RM_ANALYSE_MODE",
+    "RM_MATCH_MODE",
+    "RM_MATCH_TOP_K",
+    "RM_MATCH_PER_JOB",
+    "RM_INCREMENTAL",
+    "RM_DEDUP",
+    "RM_DEDUP_NEAR",
+    "RM_DEDUP_THRESHOLD",
+    "RM_COMPACT",
+    "RM_COMPACT_TOKENS",
+    "MODEL",
+    "OPENAI_MODEL_NAME",
+)
+
+INPUT_DIRS = (os.path.join("knowledge", "resource-resume"), os.path.join("knowledge", "job-profile"))
+
+
+def inputs_fingerprint(dirs: Tuple[str, ...] = INPUT_DIRS) -> str:
+    """Cheap identity of a kickoff: input file names, sizes and mtimes plus run settings."""
+    h = hashlib.sha256()
+    for directory in dirs:
+        try:
+            names = sorted(os.listdir(directory))
+        except Exception:
+            names = []
+        for name in names:
+            try:
+                st = os.stat(os.path.join(directory, name))
+            except Exception:
+                continue
+            h.update(f"{directory}/{name}:{st.st_size}:{st.st_mtime_ns}\n".encode("utf-8"))
+    for var in _KEY_ENV_VARS:
+        h.update(f"{var}={os.environ.get(var, '')}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+class QueueFullError(Exception):
+    """Raised when a kickoff cannot be queued; ``retry_after`` is a wait estimate in seconds."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"crew job queue is full; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Job:
+    id: str
+    key: str
+    state: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        queued_seconds = None
+        run_seconds = None
+        if self.started_at is not None:
+            queued_seconds = round(self.started_at - self.created_at, 3)
+            run_seconds = round((self.finished_at or time.time()) - self.started_at, 3)
+        return {
+            "id": self.id,
+            "state": self.state,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queued_seconds": queued_seconds,
+            "run_seconds": run_seconds,
+            "result": dict(self.result),
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """Runs crew kickoffs as jobs and tracks their state.
+
+    Runs execute on a dedicated pool of ``max_workers`` threads, separate from the
+    server's request threadpool, so long crew runs cannot starve other endpoints. At
+    most ``max_queue`` jobs may wait for a worker; beyond that ``submit`` raises
+    QueueFullError. A kickoff whose inputs match a queued or running job joins that
+    job instead of starting another run. Finished jobs are kept for status polling up
+    to ``max_finished``.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[], Dict[str, Any]],
+        max_workers: int = 1,
+        max_queue: int = 8,
+        max_finished: int = 1000,
+    ) -> None:
+        self._runner = runner
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._max_finished = max_finished
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._in_flight: Dict[str, str] = {}
+        self._waits: deque = deque(maxlen=_STATS_WINDOW)
+        self._runs: deque = deque(maxlen=_STATS_WINDOW)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crew-job")
+
+    def _counts(self) -> Tuple[int, int]:
+        queued = sum(1 for j in self._jobs.values() if j.state == QUEUED)
+        running = sum(1 for j in self._jobs.values() if j.state == RUNNING)
+        return queued, running
+
+    def _retry_after(self, queued: int) -> int:
+        avg_run = sum(self._runs) / len(self._runs) if self._runs else 30.0
+        return max(1, int(avg_run * (queued + 1) / self.max_workers))
+
+    def submit(self, key: Optional[str] = None) -> Tuple[Job, bool]:
+        """Start (or join) a run; returns the job and whether it was coalesced.
+
+        Raises QueueFullError when every worker is busy and the queue is full.
+        """
+        key = key or inputs_fingerprint()
+        with self._lock:
+            existing_id = self._in_flight.get(key)
+            if existing_id is not None:
+                existing = self._jobs.get(existing_id)
+                if existing is not None and existing.state in _IN_FLIGHT:
+                    return existing, True
+
+            queued, running = self._counts()
+            if running + queued >= self.max_workers + self.max_queue:
+                raise QueueFullError(self._retry_after(queued))
+
+            job = Job(id=uuid.uuid4().hex, key=key)
+            self._jobs[job.id] = job
+            self._in_flight[key] = job.id
+            self._prune()
+        self._executor.submit(self._run, job)
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth plus recent wait and run times, for monitoring."""
+        with self._lock:
+            queued, running = self._counts()
+            now = time.time()
+            oldest_wait = max((now - j.created_at for j in self._jobs.values() if j.state == QUEUED), default=0.0)
+            waits, runs = list(self._waits), list(self._runs)
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queued": queued,
+            "oldest_queued_seconds": round(oldest_wait, 3),
+            "avg_wait_seconds": round(sum(waits) / len(waits), 3) if waits else None,
+            "max_wait_seconds": round(max(waits), 3) if waits else None,
+            "avg_run_seconds": round(sum(runs) / len(runs), 3) if runs else None,
+        }
+
+    def _run(self, job: Job) -> None:
+        with self._lock:
+            job.state = RUNNING
+            job.started_at = time.time()
+            self._waits.append(job.started_at - job.created_at)
+        try:
+            result = self._runner() or {}
+            state, error = SUCCEEDED, None
+        except Exception as e:
+            result, state, error = {}, FAILED, str(e) or e.__class__.__name__
+        with self._lock:
+            job.result = result
+            job.state = state
+            job.error = error
+            job.finished_at = time.time()
+            self._runs.append(job.finished_at - job.started_at)
+            if self._in_flight.get(job.key) == job.id:
+                del self._in_flight[job.key]
+
+    def _prune(self) -> None:
+        finished = [j.id for j in self._jobs.values() if j.state not in _IN_FLIGHT]
+        for job_id in finished[: max(0, len(finished) - self._max_finished)]:
+            del self._jobs[job_id]
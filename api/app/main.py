@@ -1,5 +1,9 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from rm_agent_helper.metrics import render_latest
 from .routers import crew as crew_router
+from .routers import match as match_router
+from .routers import results as results_router
+from .routers import skills as skills_router
 
 
 def create_app() -> FastAPI:
@@ -9,7 +13,15 @@ def create_app() -> FastAPI:
     async def healthz() -> dict:
         return {"status": "ok"}
 
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        body, content_type = render_latest()
+        return Response(content=body, media_type=content_type)
+
     app.include_router(crew_router.router, prefix="/crew", tags=["crew"])
+    app.include_router(match_router.router, prefix="/match", tags=["match"])
+    app.include_router(results_router.router, prefix="/results", tags=["results"])
+    app.include_router(skills_router.router, prefix="/skills", tags=["skills"])
     return app
 
 
@@ -1,85 +1,112 @@
-from fastapi import APIRouter, BackgroundTasks
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import os
-import json
-from typing import Optional
+import threading
+from typing import Any, Dict, Optional
 
-from rm_agent_helper.main import run as run_cli
-from rm_agent_helper.crew import RmAgentHelper
-from rm_agent_helper.utils import coerce_result_to_json_text, normalize_candidates_json
-from rm_agent_helper.report import generate_html_report
-from rm_agent_helper.job_report import generate_job_match_html_report
-from rm_agent_helper.enrich import load_resume_texts, enrich_candidates
+from rm_agent_helper.pipeline import process_outputs
+from rm_agent_helper.settings import env_int
+
+from ..jobs import JobManager, QueueFullError, inputs_fingerprint
 
 
 router = APIRouter()
 
+# Crew runs may overlap, but report files are written by one run at a time.
+_persist_lock = threading.Lock()
+
 
 class KickoffResponse(BaseModel):
     message: str
+    job_id: Optional[str] = None
+    state: Optional[str] = None
+    deduplicated: bool = False
     output_json: Optional[str] = None
     output_html: Optional[str] = None
 
 
-def _kickoff_and_persist() -> None:
-    os.makedirs("output", exist_ok=True)
-    output_json = os.path.join("output", "resource_report.json")
-    output_html = os.path.join("output", "resource_report.html")
-    job_match_json = os.path.join("output", "job_match_report.json")
-    job_match_html = os.path.join("output", "job_match_report.html")
+class JobStatusResponse(BaseModel):
+    id: str
+    state: str
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    queued_seconds: Optional[float] = None
+    run_seconds: Optional[float] = None
+    result: Dict[str, Any] = {}
+    error: Optional[str] = None
 
-    try:
-        result = RmAgentHelper().crew().kickoff(inputs={})
-        json_text = coerce_result_to_json_text(result)
-    except Exception:
-        json_text = "[]"
-
-    json_text_stripped = (json_text or "").strip()
-    should_overwrite = True
-    if json_text_stripped == "[]" and os.path.exists(output_json):
-        try:
-            if os.path.getsize(output_json) > 2:
-                should_overwrite = False
-        except Exception:
-            should_overwrite = True
 
+class QueueStatsResponse(BaseModel):
+    max_workers: int
+    max_queue: int
+    running: int
+    queued: int
+    oldest_queued_seconds: float
+    avg_wait_seconds: Optional[float] = None
+    max_wait_seconds: Optional[float] = None
+    avg_run_seconds: Optional[float] = None
+
+
+def _kickoff_and_persist() -> Dict[str, Any]:
+    """Run the crew and write the reports; returns the run's artifacts.
+
+    If the kickoff itself fails the fallback reports are still rendered and the
+    error is re-raised so the job is marked as failed.
+    """
+    # Imported on first kickoff so API workers start without loading crewai.
+    from rm_agent_helper.crew import RmAgentHelper
+
+    kickoff_error: Optional[Exception] = None
     try:
-        if should_overwrite:
-            final_json_text = normalize_candidates_json(json_text)
-            try:
-                data = json.loads(final_json_text)
-                if isinstance(data, list):
-                    texts = load_resume_texts()
-                    data = enrich_candidates(data, texts)
-                    final_json_text = json.dumps(data)
-            except Exception:
-                pass
-            with open(output_json, "w", encoding="utf-8") as f:
-                f.write(final_json_text)
-        # Always attempt to render HTML
-        generate_html_report(output_json, output_html)
-        # If the crew's result is job-match JSON, persist and render
-        try:
-            obj = json.loads(json_text)
-            if isinstance(obj, list) and obj and isinstance(obj[0], dict) and (
-                ("job-file" in obj[0] or "job_file" in obj[0]) and "matches" in obj[0]
-            ):
-                with open(job_match_json, "w", encoding="utf-8") as f:
-                    json.dump(obj, f, ensure_ascii=False, indent=2)
-                generate_job_match_html_report(job_match_json, job_match_html)
-        except Exception:
-            pass
-    except Exception:
-        pass
+        data, match_data = RmAgentHelper().run_analysis()
+    except Exception as e:
+        kickoff_error = e
+        data, match_data = [], []
+
+    with _persist_lock:
+        artifacts = process_outputs(data, match_data, log=lambda message: None)
+
+    if kickoff_error is not None:
+        raise RuntimeError(f"crew kickoff failed: {kickoff_error}") from kickoff_error
+    return artifacts.to_dict()
+
+
+jobs = JobManager(
+    _kickoff_and_persist,
+    max_workers=env_int("RM_API_CREW_WORKERS", 1, minimum=1),
+    max_queue=env_int("RM_API_CREW_QUEUE", 8, minimum=0),
+)
 
 
 @router.post("/kickoff", response_model=KickoffResponse)
-async def kickoff(background_tasks: BackgroundTasks) -> KickoffResponse:
-    background_tasks.add_task(_kickoff_and_persist)
+async def kickoff() -> KickoffResponse:
+    # Fingerprinting stats every input file, so keep it off the event loop.
+    key = await run_in_threadpool(inputs_fingerprint)
+    try:
+        job, deduplicated = jobs.submit(key)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     return KickoffResponse(
-        message="Crew kickoff started",
+        message="Joined in-flight crew kickoff" if deduplicated else "Crew kickoff started",
+        job_id=job.id,
+        state=job.state,
+        deduplicated=deduplicated,
         output_json="output/resource_report.json",
         output_html="output/resource_report.html",
     )
 
 
+@router.get("/queue", response_model=QueueStatsResponse)
+async def queue_stats() -> QueueStatsResponse:
+    return QueueStatsResponse(**jobs.stats())
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def job_status(job_id: str) -> JobStatusResponse:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return JobStatusResponse(**job.to_dict())
+
+
@@ -0,0 +1,181 @@
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+from rm_agent_helper.quick_match import (
+    find_job,
+    find_resume,
+    match_job_to_resumes,
+    match_resume_to_jobs,
+)
+from rm_agent_helper.settings import env_int
+from rm_agent_helper.tools.extraction_cache import cached_extract_text
+from rm_agent_helper.tools.extractors import is_resume_file
+
+
+router = APIRouter()
+
+# Refinement kicks off an LLM crew on the request thread, outside the crew job queue;
+# cap how many run at once so refine requests get the same 429 backpressure.
+_refine_slots = threading.BoundedSemaphore(env_int("RM_API_REFINE_CONCURRENCY", 2, minimum=1))
+_REFINE_RETRY_AFTER = 10
+
+
+class ResumeMatchRequest(BaseModel):
+    resource_file: Optional[str] = None
+    text: Optional[str] = None
+    top_k: int = 10
+    refine: bool = False
+
+
+class JobMatchRequest(BaseModel):
+    job_file: Optional[str] = None
+    text: Optional[str] = None
+    top_k: int = 10
+    refine: bool = False
+
+
+def _refine(jobs: List[Dict[str, Any]], resumes: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """Re-score a small shortlist with the job_matcher LLM; None if that fails.
+
+    Raises a 429 HTTPException when RM_API_REFINE_CONCURRENCY refinements are already running.
+    """
+    if not _refine_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=429,
+            detail="Too many refine requests in progress; retry later",
+            headers={"Retry-After": str(_REFINE_RETRY_AFTER)},
+        )
+    try:
+        # Imported lazily: the local scoring path must not pay for loading crewai.
+        from rm_agent_helper.crew import RmAgentHelper
+        from rm_agent_helper.utils import coerce_result
+
+        payload = json.dumps({"jobs": jobs, "resumes": resumes}, ensure_ascii=False)
+        helper = RmAgentHelper()
+        result = helper.kickoff_instrumented(helper.shortlist_match_crew(), "llm_match_refine", {"shortlist": payload})
+        data = coerce_result(result)
+        return data if isinstance(data, list) and data else None
+    except Exception:
+        return None
+    finally:
+        _refine_slots.release()
+
+
+def _percent(value: Any) -> Optional[int]:
+    """LLM percents may come back as strings ("65", "65.5"); None when unusable."""
+    try:
+        return max(0, min(100, int(round(float(value)))))
+    except (TypeError, ValueError):
+        return None
+
+
+def _refined_percents(refined: List[Dict[str, Any]], key) -> Dict[str, int]:
+    percents: Dict[str, int] = {}
+    for entry in refined:
+        matches = entry.get("matches") if isinstance(entry, dict) else None
+        for m in matches if isinstance(matches, list) else []:
+            percent = _percent(m.get("percent")) if isinstance(m, dict) else None
+            if percent is not None:
+                percents[key(entry, m)] = percent
+    return percents
+
+
+def _resume_response(text: str, resource_file: str, top_k: int, refine: bool) -> Dict[str, Any]:
+    response = match_resume_to_jobs(text, resource_file, top_k)
+    response["mode"] = "lexical"
+    if refine and response["matches"]:
+        name = resource_file or "uploaded-resume"
+        jobs = [
+            {"job-file": m["job-file"], "text": (find_job(m["job-file"]) or {}).get("text", ""), "candidates": [name]}
+            for m in response["matches"]
+        ]
+        refined = _refine(jobs, [{"resource-file": name, "text": text}])
+        if refined is not None:
+            percents = _refined_percents(refined, lambda entry, m: entry.get("job-file"))
+            for m in response["matches"]:
+                if m["job-file"] in percents:
+                    m["percent"] = percents[m["job-file"]]
+            response["matches"].sort(key=lambda m: -m["percent"])
+            response["mode"] = "llm"
+    return response
+
+
+@router.post("/resume")
+def match_resume(request: ResumeMatchRequest) -> Dict[str, Any]:
+    """Score one referenced (resource_file) or pasted (text) resume against every job."""
+    resource_file = request.resource_file or ""
+    text = request.text
+    if text is None:
+        if not resource_file:
+            raise HTTPException(status_code=422, detail="Provide resource_file or text")
+        resume = find_resume(resource_file)
+        if resume is None:
+            raise HTTPException(status_code=404, detail=f"Unknown resume: {resource_file}")
+        text = str(resume.get("text") or "")
+    return _resume_response(text, resource_file, request.top_k, request.refine)
+
+
+@router.post("/resume/upload")
+async def match_resume_upload(
+    file: UploadFile = File(...),
+    top_k: int = Form(10),
+    refine: bool = Form(False),
+) -> Dict[str, Any]:
+    """Score an uploaded resume file (.pdf/.docx/.txt/.md) against every job."""
+    file_name = os.path.basename(file.filename or "")
+    if not is_resume_file(file_name):
+        raise HTTPException(status_code=415, detail="Supported formats: .pdf, .docx, .txt, .md")
+    content = await file.read()
+    # Extraction and an optional refine kickoff block, so they run in the threadpool.
+    return await run_in_threadpool(_upload_response, content, file_name, top_k, refine)
+
+
+def _upload_response(content: bytes, file_name: str, top_k: int, refine: bool) -> Dict[str, Any]:
+    suffix = os.path.splitext(file_name)[1]
+    fd, tmp_path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        # Content-addressed, so re-uploads of the same file skip extraction.
+        text = cached_extract_text(tmp_path)
+    finally:
+        try:
+            os.remove(tmp_path)
+        except Exception:
+            pass
+    return _resume_response(text, file_name, top_k, refine)
+
+
+@router.post("/job")
+def match_job(request: JobMatchRequest) -> Dict[str, Any]:
+    """Score one referenced (job_file) or pasted (text) job against every resume."""
+    job_file = request.job_file or ""
+    text = request.text
+    if text is None:
+        if not job_file:
+            raise HTTPException(status_code=422, detail="Provide job_file or text")
+        job = find_job(job_file)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job profile: {job_file}")
+        text = str(job.get("text") or "")
+
+    response = match_job_to_resumes(text, job_file, request.top_k)
+    response["mode"] = "lexical"
+    if request.refine and response["matches"]:
+        files = [m["resource-file"] for m in response["matches"]]
+        resumes = [{"resource-file": f, "text": (find_resume(f) or {}).get("text", "")} for f in files]
+        refined = _refine([{"job-file": job_file or "job", "text": text, "candidates": files}], resumes)
+        if refined is not None:
+            percents = _refined_percents(refined, lambda entry, m: m.get("resource-file"))
+            for m in response["matches"]:
+                if m["resource-file"] in percents:
+                    m["percent"] = percents[m["resource-file"]]
+            response["matches"].sort(key=lambda m: -m["percent"])
+            response["mode"] = "llm"
+    return response
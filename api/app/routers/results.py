@@ -0,0 +1,57 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Any, Dict, Optional
+
+from rm_agent_helper.result_store import ResultStore, get_result_store
+
+
+router = APIRouter()
+
+
+def _store() -> ResultStore:
+    store = get_result_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Result store is disabled (RM_RESULTS_STORE=0)")
+    return store
+
+
+@router.get("/runs")
+def list_runs(
+    limit: int = Query(20, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+) -> Dict[str, Any]:
+    """Recorded runs, newest first."""
+    return _store().runs(limit=limit, offset=offset)
+
+
+@router.get("/candidates")
+def list_candidates(
+    skill: Optional[str] = None,
+    title: Optional[str] = None,
+    name: Optional[str] = None,
+    run_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+) -> Dict[str, Any]:
+    """Candidates of a run (default: latest) filtered by skill, title prefix and name prefix."""
+    return _store().candidates(skill=skill, title=title, name=name, run_id=run_id, limit=limit, offset=offset)
+
+
+@router.get("/jobs")
+def list_jobs(run_id: Optional[int] = None) -> Dict[str, Any]:
+    """Jobs scored in a run (default: latest run with job matches)."""
+    return _store().jobs(run_id=run_id)
+
+
+@router.get("/matches")
+def list_matches(
+    job_file: Optional[str] = None,
+    resource_file: Optional[str] = None,
+    min_percent: int = Query(0, ge=0, le=100),
+    run_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+) -> Dict[str, Any]:
+    """Match scores of a run (default: latest), best first, filtered by job, resume and minimum percent."""
+    return _store().matches(
+        job_file=job_file, resource_file=resource_file, min_percent=min_percent, run_id=run_id, limit=limit, offset=offset
+    )
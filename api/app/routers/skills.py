@@ -0,0 +1,57 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Any, Dict, List, Optional
+
+from rm_agent_helper.skills import canonical_skill, get_skill_index
+
+
+router = APIRouter()
+
+
+@router.get("")
+def list_skills(limit: int = Query(100, ge=1, le=1000)) -> Dict[str, Any]:
+    """Canonical skills in the index with their candidate counts, most common first."""
+    index = get_skill_index()
+    counts = index.skill_counts()
+    return {
+        "candidates": len(index),
+        "total": len(counts),
+        "items": [{"skill": skill, "candidates": count} for skill, count in counts[:limit]],
+    }
+
+
+@router.get("/canonical")
+def canonical(skill: str) -> Dict[str, Any]:
+    """Canonical form of a free-form skill string."""
+    return {"skill": skill, "canonical": canonical_skill(skill)}
+
+
+@router.get("/search")
+def search(
+    q: Optional[str] = None,
+    all_skills: List[str] = Query([], alias="all"),
+    any_skills: List[str] = Query([], alias="any"),
+    none_skills: List[str] = Query([], alias="none"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+) -> Dict[str, Any]:
+    """Candidates matching a boolean skill query.
+
+    Pass ``q`` (e.g. ``python AND (kubernetes OR docker) AND NOT java``) or any of the
+    repeatable ``all`` / ``any`` / ``none`` skill lists.
+    """
+    index = get_skill_index()
+    if q:
+        try:
+            files = index.query(q)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    elif all_skills or any_skills or none_skills:
+        files = index.search(all_skills, any_skills, none_skills)
+    else:
+        raise HTTPException(status_code=422, detail="Provide q or at least one of all, any, none")
+    return {
+        "total": len(files),
+        "limit": limit,
+        "offset": offset,
+        "items": [index.candidates[f] for f in files[offset:offset + limit]],
+    }
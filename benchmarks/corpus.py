@@ -0,0 +1,193 @@
+"""Synthetic resume / job-profile corpus for benchmarks.
+
+Writes DOCX and PDF files directly (no python-docx or PDF library needed) so a
+corpus can be generated on any machine, deterministically from a seed.
+"""
+import json
+import os
+import random
+import zipfile
+from typing import Any, Dict, List
+from xml.sax.saxutils import escape
+
+
+FIRST_NAMES = [
+    "Aisha", "Ben", "Carla", "Deepak", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jonas",
+    "Kavya", "Liam", "Mira", "Noah", "Olga", "Priya", "Quinn", "Rafael", "Sara", "Tomas",
+]
+LAST_NAMES = [
+    "Anderson", "Bauer", "Chen", "Dubois", "Evans", "Fischer", "Garcia", "Haddad", "Ito", "Jensen",
+    "Karlsson", "Lopez", "Murphy", "Nair", "Okafor", "Patel", "Rossi", "Silva", "Tanaka", "Weber",
+]
+TITLES = [
+    "Senior Test Engineer", "Data Analyst", "Backend Developer", "Cloud Engineer", "Accountant",
+    "Marketing Manager", "Business Analyst", "DevOps Engineer", "Product Owner", "Frontend Developer",
+]
+SKILLS = [
+    "Python", "Java", "SQL", "Kubernetes", "AWS", "Azure", "Docker", "Terraform", "React", "TypeScript",
+    "Selenium", "Agile", "Scrum", "Excel", "Power BI", "Tableau", "Spark", "Kafka", "Go", "C#",
+    "Accounting", "Auditing", "SEO", "Social Media", "Stakeholder Management", "Jira", "Linux", "Git",
+]
+FILLER = (
+    "Delivered measurable improvements across cross-functional teams while owning planning, "
+    "execution and reporting for a portfolio of initiatives. "
+)
+
+
+def _resume_lines(rng: random.Random, index: int) -> List[str]:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, rng.randint(5, 12))
+    lines = [name, title, f"{name.lower().replace(' ', '.')}{index}@example.com", "", "SUMMARY",
+             f"{title} with {rng.randint(2, 20)} years of experience. " + FILLER * rng.randint(1, 3), "",
+             "SKILLS", ", ".join(skills), "", "EXPERIENCE"]
+    for _ in range(rng.randint(2, 5)):
+        lines.append(f"{rng.choice(TITLES)} at Company {rng.randint(1, 500)} ({rng.randint(2005, 2024)})")
+        lines.append(FILLER * rng.randint(2, 6))
+    lines += ["", "EDUCATION", f"B.Sc. from University {rng.randint(1, 100)}"]
+    return lines
+
+
+def _job_lines(rng: random.Random) -> List[str]:
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, rng.randint(4, 8))
+    return [title, "", "Responsibilities", FILLER * rng.randint(2, 5), "",
+            "Qualifications", "Experience with " + ", ".join(skills) + ".", FILLER]
+
+
+def write_docx(path: str, lines: List[str]) -> None:
+    body = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        "</Types>"
+    )
+    rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/></Relationships>'
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", content_types)
+        zf.writestr("_rels/.rels", rels)
+        zf.writestr("word/document.xml", document)
+
+
+def _pdf_escape(text: str) -> str:
+    return text.encode("latin-1", "replace").decode("latin-1").replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, lines: List[str], lines_per_page: int = 50) -> None:
+    # Wrap long lines so each page holds a readable amount of text.
+    wrapped: List[str] = []
+    for line in lines:
+        while len(line) > 90:
+            wrapped.append(line[:90])
+            line = line[90:]
+        wrapped.append(line)
+    pages = [wrapped[i:i + lines_per_page] for i in range(0, len(wrapped), lines_per_page)] or [[""]]
+
+    objects: List[bytes] = []
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{' '.join(f'{p} 0 R' for p in page_ids)}] /Count {len(pages)} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for page_lines in pages:
+        stream = "BT /F1 10 Tf 14 TL 50 800 Td " + " ".join(f"({_pdf_escape(l)}) Tj T*" for l in page_lines) + " ET"
+        page_id = 4 + len(objects) - 3
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {page_id + 1} 0 R >>".encode()
+        )
+        data = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(bytes(out))
+
+
+def generate_corpus(root: str, n_resumes: int, n_jobs: int, seed: int = 7) -> Dict[str, int]:
+    """Write ``n_resumes`` resumes (cycling DOCX, PDF, TXT, MD) and ``n_jobs`` job profiles
+    under ``root/knowledge``; returns the number of files per format.
+    """
+    rng = random.Random(seed)
+    resume_dir = os.path.join(root, "knowledge", "resource-resume")
+    job_dir = os.path.join(root, "knowledge", "job-profile")
+    os.makedirs(resume_dir, exist_ok=True)
+    os.makedirs(job_dir, exist_ok=True)
+
+    formats = ["docx", "pdf", "txt", "md"]
+    counts = {fmt: 0 for fmt in formats}
+    for i in range(n_resumes):
+        fmt = formats[i % len(formats)]
+        lines = _resume_lines(rng, i)
+        path = os.path.join(resume_dir, f"resume_{i:06d}.{fmt}")
+        if fmt == "docx":
+            write_docx(path, lines)
+        elif fmt == "pdf":
+            write_pdf(path, lines)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines))
+        counts[fmt] += 1
+
+    for j in range(n_jobs):
+        with open(os.path.join(job_dir, f"job_{j:04d}.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(_job_lines(rng)))
+    counts["jobs"] = n_jobs
+    return counts
+
+
+def synthetic_candidates(n: int, seed: int = 11) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "resource-name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "resource-job-title": rng.choice(TITLES),
+            "experties": rng.sample(SKILLS, rng.randint(5, 12)),
+            "resource-file": f"resume_{i:06d}.{['docx', 'pdf', 'txt', 'md'][i % 4]}",
+        }
+        for i in range(n)
+    ]
+
+
+def synthetic_job_matches(n_jobs: int, n_resumes: int, seed: int = 13) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    report = []
+    for j in range(n_jobs):
+        matches = [
+            {"resource-file": f"resume_{i:06d}.txt", "resource-name": f"Candidate {i}", "percent": rng.randint(0, 100)}
+            for i in range(n_resumes)
+        ]
+        matches.sort(key=lambda m: -m["percent"])
+        report.append({"job-file": f"job_{j:04d}.txt", "job-title": rng.choice(TITLES), "matches": matches})
+    return report
+
+
+def synthetic_llm_output(n: int) -> str:
+    """A large crew-style answer: prose around a fenced JSON candidate array."""
+    payload = json.dumps(synthetic_candidates(n), indent=2)
+    return f"Here is the final answer for all resumes:\n```json\n{payload}\n```\nLet me know if you need more."
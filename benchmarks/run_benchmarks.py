@@ -0,0 +1,289 @@
+"""Benchmark suite for the non-LLM parts of the pipeline.
+
+Generates a synthetic corpus (see corpus.py), then measures throughput and peak
+Python memory for resume/job loading, JSON extraction/normalisation of large LLM
+outputs and HTML report rendering. No LLM or network access is needed.
+
+    python benchmarks/run_benchmarks.py --resumes 400 --jobs 40 --sizes 10000,100000
+
+Results are written as JSON (default: bench_results.json) so runs can be compared
+release to release.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from corpus import (  # noqa: E402
+    generate_corpus,
+    synthetic_candidates,
+    synthetic_job_matches,
+    synthetic_llm_output,
+)
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Best/mean wall time over ``repeat`` runs, then one extra traced run for peak memory.
+
+    Timing runs are not traced, as tracemalloc slows allocation-heavy code considerably.
+    """
+    times: List[float] = []
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds_best": round(min(times), 6),
+        "seconds_mean": round(statistics.mean(times), 6),
+        "peak_mb": round(peak / (1024 * 1024), 3),
+    }
+
+
+@contextlib.contextmanager
+def _env(**values: Optional[str]) -> Iterator[None]:
+    previous = {k: os.environ.get(k) for k in values}
+    for k, v in values.items():
+        if v is None:
+            os.environ.pop(k, None)
+        else:
+            os.environ[k] = v
+    try:
+        yield
+    finally:
+        for k, v in previous.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+class Suite:
+    def __init__(self, repeat: int, only: Optional[List[str]] = None) -> None:
+        self.repeat = repeat
+        self.only = only
+        self.results: List[Dict[str, Any]] = []
+
+    def run(self, name: str, size: int, fn: Callable[[], Any], repeat: Optional[int] = None, **extra: Any) -> None:
+        if self.only and not any(name.startswith(prefix) for prefix in self.only):
+            return
+        print(f"  {name} (n={size}) ...", end="", flush=True)
+        try:
+            stats = _measure(fn, self.repeat if repeat is None else repeat)
+        except Exception as e:
+            print(f" error: {e}")
+            self.results.append({"name": name, "size": size, "status": "error", "error": str(e), **extra})
+            return
+        throughput = size / stats["seconds_best"] if stats["seconds_best"] > 0 else None
+        print(f" {stats['seconds_best']:.3f}s, {stats['peak_mb']:.1f} MB peak")
+        self.results.append({
+            "name": name,
+            "size": size,
+            "status": "ok",
+            **stats,
+            "items_per_second": round(throughput, 2) if throughput else None,
+            **extra,
+        })
+
+    def skip(self, name: str, size: int, reason: str) -> None:
+        if self.only and not any(name.startswith(prefix) for prefix in self.only):
+            return
+        print(f"  {name}: skipped ({reason})")
+        self.results.append({"name": name, "size": size, "status": "skipped", "reason": reason})
+
+
+def bench_loading(suite: Suite, workdir: str, n_resumes: int, n_jobs: int) -> None:
+    from rm_agent_helper.tools.extractors import extract_text, list_resume_files
+    from rm_agent_helper.tools.loaders import RESOURCE_RESUME_DIR, load_job_profiles, load_resource_resumes
+
+    files = list_resume_files(RESOURCE_RESUME_DIR)
+    for fmt in ("txt", "md", "docx", "pdf"):
+        paths = [os.path.join(RESOURCE_RESUME_DIR, f) for f in files if f.endswith("." + fmt)]
+        if paths:
+            suite.run(f"extract_text.{fmt}", len(paths), lambda paths=paths: [extract_text(p) for p in paths])
+
+    with _env(RM_EXTRACTION_CACHE="0"):
+        suite.run("load_resource_resumes.cold", n_resumes, load_resource_resumes)
+    with _env(RM_EXTRACTION_CACHE="1", RM_EXTRACTION_CACHE_DIR=os.path.join(workdir, ".cache", "extraction")):
+        load_resource_resumes()  # prime the cache
+        suite.run("load_resource_resumes.warm", n_resumes, load_resource_resumes)
+        resumes = load_resource_resumes()
+    suite.run("load_job_profiles", n_jobs, load_job_profiles)
+    from rm_agent_helper.compact import compact_resumes
+
+    suite.run("compact_resumes", n_resumes, lambda: compact_resumes(resumes))
+
+    try:
+        from rm_agent_helper.tools.custom_tool import JobProfileLoaderTool, ResourceResumeAnalyzerTool
+    except Exception as e:
+        reason = f"tools unavailable: {e.__class__.__name__}: {e}"
+        suite.skip("ResourceResumeAnalyzerTool._run", n_resumes, reason)
+        suite.skip("JobProfileLoaderTool._run", n_jobs, reason)
+        return
+    resume_tool = ResourceResumeAnalyzerTool()
+    job_tool = JobProfileLoaderTool()
+    with _env(RM_EXTRACTION_CACHE="0"):
+        suite.run("ResourceResumeAnalyzerTool._run", n_resumes, resume_tool._run)
+    suite.run("JobProfileLoaderTool._run", n_jobs, job_tool._run)
+
+
+def bench_json(suite: Suite, sizes: List[int]) -> None:
+    from rm_agent_helper.utils import (
+        extract_json_text,
+        normalize_candidates,
+        normalize_candidates_json,
+        parse_json_output,
+    )
+
+    for size in sizes:
+        raw = synthetic_llm_output(size)
+        input_mb = round(len(raw) / 1e6, 2)
+        suite.run("extract_json_text", size, lambda raw=raw: extract_json_text(raw), input_mb=input_mb)
+        json_text = extract_json_text(raw)
+        suite.run("normalize_candidates_json", size, lambda t=json_text: normalize_candidates_json(t))
+        # Object-level stages used by the pipeline itself (no re-serialisation).
+        suite.run("parse_json_output", size, lambda raw=raw: parse_json_output(raw), input_mb=input_mb)
+        data = parse_json_output(raw)
+        suite.run("normalize_candidates", size, lambda d=data: normalize_candidates(d))
+
+
+def bench_html(suite: Suite, workdir: str, sizes: List[int], match_jobs: int) -> None:
+    from rm_agent_helper.job_report import generate_job_match_html_report
+    from rm_agent_helper.report import generate_html_report
+
+    out_dir = os.path.join(workdir, "output")
+    os.makedirs(out_dir, exist_ok=True)
+    for size in sizes:
+        json_path = os.path.join(out_dir, f"resource_report_{size}.json")
+        html_path = os.path.join(out_dir, f"resource_report_{size}.html")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(synthetic_candidates(size), f)
+        suite.run(
+            "generate_html_report", size, lambda j=json_path, h=html_path: generate_html_report(j, h), repeat=1,
+        )
+
+        # ``size`` candidates scored against ``match_jobs`` jobs.
+        match_path = os.path.join(out_dir, f"job_match_report_{size}.json")
+        match_html = os.path.join(out_dir, f"job_match_report_{size}.html")
+        with open(match_path, "w", encoding="utf-8") as f:
+            json.dump(synthetic_job_matches(match_jobs, size), f)
+        suite.run(
+            "generate_job_match_html_report", size,
+            lambda j=match_path, h=match_html: generate_job_match_html_report(j, h),
+            repeat=1, jobs=match_jobs,
+        )
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10, check=True,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _available(module: str) -> bool:
+    try:
+        __import__(module)
+        return True
+    except Exception:
+        return False
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=200, help="synthetic resumes to generate")
+    parser.add_argument("--jobs", type=int, default=20, help="synthetic job profiles to generate")
+    parser.add_argument("--sizes", default="10000,100000", help="comma-separated candidate counts for JSON/HTML")
+    parser.add_argument("--match-jobs", type=int, default=5, help="jobs in the synthetic job match report")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark (HTML runs once)")
+    parser.add_argument("--only", default="", help="comma-separated benchmark name prefixes to run")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--workdir", default="", help="corpus directory (default: a temporary one)")
+    parser.add_argument("--keep", action="store_true", help="keep the generated corpus")
+    parser.add_argument(
+        "--output",
+        default=os.path.join(HERE, "results", "bench_results.json"),
+        help="where to write the JSON results (default: benchmarks/results/bench_results.json)",
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix="rm_bench_")
+    output = os.path.abspath(args.output)
+    suite = Suite(args.repeat, [p.strip() for p in args.only.split(",") if p.strip()] or None)
+
+    print(f"Generating corpus in {workdir} ...")
+    start = time.perf_counter()
+    counts = generate_corpus(workdir, args.resumes, args.jobs, seed=args.seed)
+    print(f"  {counts} in {time.perf_counter() - start:.1f}s")
+
+    cwd = os.getcwd()
+    # The loaders read the knowledge/ folders relative to the working directory.
+    os.chdir(workdir)
+    try:
+        print("Loading:")
+        bench_loading(suite, workdir, args.resumes, args.jobs)
+        print("JSON:")
+        bench_json(suite, sizes)
+        print("HTML:")
+        bench_html(suite, workdir, sizes, args.match_jobs)
+    finally:
+        os.chdir(cwd)
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "schema": 1,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "optional_libraries": {m: _available(m) for m in ("crewai", "pypdf", "docx", "docx2txt", "mammoth")},
+        "parameters": {
+            "resumes": args.resumes,
+            "jobs": args.jobs,
+            "sizes": sizes,
+            "match_jobs": args.match_jobs,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "corpus": counts,
+        "results": suite.results,
+    }
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
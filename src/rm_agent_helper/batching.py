@@ -0,0 +1,57 @@
+from typing import Any, Dict, List
+
+
+# Rough chars-per-token ratio for English prose; good enough for budgeting
+# prompts without pulling in a tokenizer.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def pack_batches(
+    items: List[Dict[str, Any]],
+    token_budget: int,
+    text_key: str = "text",
+    overhead_tokens: int = 32,
+) -> List[List[Dict[str, Any]]]:
+    """Bin-pack items into batches whose estimated size stays under ``token_budget``.
+
+    Uses first-fit decreasing so large resumes are placed first and smaller ones
+    fill the gaps. An item that alone exceeds the budget has its text truncated
+    and gets a batch of its own. Items keep their input order within a batch.
+    """
+    budget = max(1, token_budget)
+    max_chars = max(0, (budget - overhead_tokens) * CHARS_PER_TOKEN)
+
+    sized: List[tuple[int, int, Dict[str, Any]]] = []
+    for index, item in enumerate(items):
+        text = str(item.get(text_key) or "")
+        if len(text) > max_chars:
+            item = {**item, text_key: text[:max_chars]}
+            text = item[text_key]
+        sized.append((estimate_tokens(text) + overhead_tokens, index, item))
+
+    bins: List[List[tuple[int, Dict[str, Any]]]] = []
+    loads: List[int] = []
+    for cost, index, item in sorted(sized, key=lambda entry: (-entry[0], entry[1])):
+        for b, load in enumerate(loads):
+            if load + cost <= budget:
+                bins[b].append((index, item))
+                loads[b] += cost
+                break
+        else:
+            bins.append([(index, item)])
+            loads.append(cost)
+
+    return [[item for _, item in sorted(b, key=lambda entry: entry[0])] for b in bins]
+
+
+def merge_arrays(results: List[Any]) -> List[Dict[str, Any]]:
+    """Concatenate the dict elements of several parsed JSON-array outputs."""
+    merged: List[Dict[str, Any]] = []
+    for data in results:
+        if isinstance(data, list):
+            merged.extend(item for item in data if isinstance(item, dict))
+    return merged
@@ -0,0 +1,241 @@
+import re
+from collections import Counter
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from rm_agent_helper.batching import CHARS_PER_TOKEN, estimate_tokens
+from rm_agent_helper.metrics import timed
+from rm_agent_helper.settings import env_flag, env_int
+
+
+DEFAULT_TOKEN_BUDGET = 800
+
+_HEADINGS: Dict[str, str] = {}
+for _kind, _names in (
+    ("summary", "summary|profile|professional summary|career summary|professional profile|about me|about"
+                "|objective|career objective|overview|personal statement"),
+    ("skills", "skills|key skills|technical skills|core skills|skill set|skillset|skills summary|competencies"
+               "|core competencies|key competencies|expertise|areas of expertise|technical expertise"
+               "|technologies|tools|tools and technologies|technical proficiencies|strengths"),
+    ("experience", "experience|work experience|professional experience|relevant experience|employment"
+                   "|employment history|work history|career history|professional background"),
+    ("education", "education|academic background|academic qualifications|qualifications|education and training"),
+    ("certifications", "certifications|certification|certificates|licenses|licenses and certifications"
+                       "|training|courses"),
+    ("projects", "projects|key projects|personal projects|academic projects|project experience"),
+    ("other", "languages|awards|achievements|honors|honours|publications|volunteering|volunteer experience"
+              "|activities|leadership|affiliations|memberships"),
+    ("contact", "contact|contact details|contact information|contact info"),
+    ("drop", "references|referees|hobbies|interests|hobbies and interests|personal interests|declaration"
+             "|personal details|personal information|personal data"),
+):
+    for _name in _names.split("|"):
+        _HEADINGS[_name] = _kind
+
+# Tier for (short line, first sentence of a long line, rest of a long line) by section;
+# lower tiers are kept first. "drop" sections are never kept on their own.
+_TIERS: Dict[str, Tuple[int, int, int]] = {
+    "header": (0, 0, 2),
+    "summary": (0, 0, 2),
+    "skills": (0, 0, 1),
+    "experience": (0, 1, 2),
+    "certifications": (1, 1, 2),
+    "education": (1, 2, 3),
+    "projects": (1, 2, 3),
+    "other": (1, 2, 3),
+    "contact": (1, 2, 3),
+}
+_MAX_TIER = 3
+_SHORT_LINE_WORDS = 12
+# A multi-word line seen this many times is a page header or footer, not content.
+_REPEATED_LINE = 3
+
+_SPACE_RE = re.compile(r"\s+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+")
+_HEADING_CLEAN_RE = re.compile(r"[^a-z& ]+")
+# Contact tokens: emails, links, phone numbers and the labels in front of them. Phone
+# numbers need separated digit groups ("(555) 123-4567", "+44 20 7946 0958") and at
+# least _PHONE_DIGITS digits, so figures such as "1234567890 events" or dates such as
+# "12.05.2020" are left alone.
+_CONTACT_RE = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.-]+"
+    r"|(?:https?://|www\.)\S+"
+    r"|(?:[\w-]+\.)*(?:linkedin|github)\.com\S*"
+    r"|(?P<phone>(?<![\w.])(?:\+\d{1,3}[ .-]?)?(?:\(\d{2,4}\)|\d{2,4})(?:[ .-]\d{2,4}){2,3}(?![\w.]\w))"
+    r"|\b(?:e-?mail|phone|tel|mobile|cell|linkedin|github|website|web)\s*:",
+    re.IGNORECASE,
+)
+_PHONE_DIGITS = 9
+_SEPARATOR_RUN_RE = re.compile(r"(?:\s*[|\u2022\u00b7,;]\s*){2,}")
+_SEPARATOR_CHARS = " \t|\u2022\u00b7,;:-"
+_PAGE_RE = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$", re.IGNORECASE)
+
+
+def compaction_enabled() -> bool:
+    return env_flag("RM_COMPACT", True)
+
+
+def compact_token_budget() -> int:
+    return env_int("RM_COMPACT_TOKENS", DEFAULT_TOKEN_BUDGET, minimum=64)
+
+
+def heading_kind(line: str) -> Optional[str]:
+    """Section kind for a heading line ("skills", "experience", ...), or None if it is not one."""
+    if len(line) > 40:
+        return None
+    name = _HEADING_CLEAN_RE.sub(" ", line.lower().replace(" and ", " & ")).replace("&", " and ")
+    name = _SPACE_RE.sub(" ", name).strip()
+    if not name or len(name.split()) > 4:
+        return None
+    return _HEADINGS.get(name)
+
+
+def _contact_replacement(match: "re.Match[str]") -> str:
+    phone = match.group("phone")
+    if phone is not None and sum(c.isdigit() for c in phone) < _PHONE_DIGITS:
+        return match.group(0)
+    return " "
+
+
+def strip_contact(line: str) -> str:
+    """``line`` without email, link and phone tokens (and the separators around them).
+
+    Contact details carry nothing the analysis extracts, but the rest of the line may:
+    "John Smith | john@example.com | (555) 123-4567" keeps "John Smith".
+    """
+    if not _CONTACT_RE.search(line):
+        return line
+    stripped = _SEPARATOR_RUN_RE.sub(" | ", _CONTACT_RE.sub(_contact_replacement, line))
+    return _SPACE_RE.sub(" ", stripped).strip(_SEPARATOR_CHARS)
+
+
+def _pieces(lines: List[str]) -> List[Tuple[int, str, int]]:
+    """Split lines into (line index, text, tier) pieces; headings are tier 0."""
+    pieces: List[Tuple[int, str, int]] = []
+    kinds: FrozenSet[str] = frozenset(("header",))
+    after_heading = False
+    for index, line in enumerate(lines):
+        kind = heading_kind(line)
+        if index == 0 and kind is None:
+            # The first line is almost always the candidate's name; it is never dropped.
+            pieces.append((index, strip_contact(line) or line, 0))
+            continue
+        if kind is not None:
+            # Multi-column layouts stack headings ("EXPERIENCE" then "SKILLS") before
+            # their content, so lines after a run of headings belong to all of them.
+            kinds = (kinds | {kind}) if after_heading else frozenset((kind,))
+            after_heading = True
+            pieces.append((index, line, 0))
+            continue
+        after_heading = False
+        tiers = [_TIERS[k] for k in kinds if k in _TIERS]
+        if not tiers or _PAGE_RE.match(line):
+            continue
+        line = strip_contact(line)
+        if not line:
+            continue
+        short, first, rest = (min(t[i] for t in tiers) for i in range(3))
+        if len(line.split()) <= _SHORT_LINE_WORDS:
+            pieces.append((index, line, short))
+            continue
+        sentences = _SENTENCE_RE.split(line)
+        pieces.append((index, sentences[0], first))
+        pieces.extend((index, sentence, rest) for sentence in sentences[1:])
+    return pieces
+
+
+def compact_resume_text(text: str, token_budget: Optional[int] = None) -> str:
+    """Shrink a resume to the parts the analysis and matching need, within ``token_budget``.
+
+    Whitespace is collapsed, repeated lines (page headers/footers), page numbers,
+    contact tokens and reference/hobby/declaration sections are dropped; the first
+    line is always kept. The rest is
+    kept in priority order until the budget is spent: the header, summary, skills and
+    job-title lines first, then experience descriptions, then education, projects and
+    other sections. Kept text stays in its original order.
+    """
+    if token_budget is None:
+        token_budget = compact_token_budget()
+    max_chars = max(1, token_budget) * CHARS_PER_TOKEN
+
+    all_lines = [_SPACE_RE.sub(" ", raw).strip() for raw in (text or "").splitlines()]
+    counts = Counter(line.lower() for line in all_lines if line)
+    lines: List[str] = []
+    repeated = set()
+    for line in all_lines:
+        if not line:
+            continue
+        key = line.lower()
+        if counts[key] >= _REPEATED_LINE and " " in line:
+            if key in repeated:
+                continue
+            repeated.add(key)
+        lines.append(line)
+
+    # Boilerplate sentences repeated across entries are only worth sending once.
+    pieces: List[Tuple[int, str, int]] = []
+    seen_sentences = set()
+    for index, piece, tier in _pieces(lines):
+        if len(piece.split()) > _SHORT_LINE_WORDS or piece != lines[index]:
+            key = piece.lower()
+            if key in seen_sentences:
+                continue
+            seen_sentences.add(key)
+        pieces.append((index, piece, tier))
+    kept = [False] * len(pieces)
+    used = 0
+    for tier in range(_MAX_TIER + 1):
+        for i, (_, piece, piece_tier) in enumerate(pieces):
+            if piece_tier != tier:
+                continue
+            cost = len(piece) + 1
+            if used + cost <= max_chars:
+                kept[i] = True
+                used += cost
+
+    out: Dict[int, List[str]] = {}
+    for i, (index, piece, _) in enumerate(pieces):
+        if kept[i]:
+            out.setdefault(index, []).append(piece)
+
+    # A heading (or a run of stacked headings) is only kept when some of the content
+    # that follows it is.
+    result: List[str] = []
+    headings: List[str] = []
+    previous_heading = False
+    for index, line in enumerate(lines):
+        kind = heading_kind(line)
+        if kind is not None:
+            if not previous_heading:
+                headings = []
+            if kind != "drop":
+                headings.append(line)
+            previous_heading = True
+            continue
+        previous_heading = False
+        if index in out:
+            result.extend(headings)
+            headings = []
+            result.append(" ".join(out[index]))
+
+    compacted = "\n".join(result)
+    if not compacted:
+        return " ".join(lines)[:max_chars]
+    return compacted
+
+
+@timed("compact_resumes")
+def compact_resumes(resumes: List[Dict[str, Any]], token_budget: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Copies of ``resumes`` with compacted text (unchanged when RM_COMPACT=0)."""
+    if not compaction_enabled():
+        return resumes
+    if token_budget is None:
+        token_budget = compact_token_budget()
+    return [{**r, "text": compact_resume_text(str(r.get("text") or ""), token_budget)} for r in resumes]
+
+
+def compaction_ratio(before: List[Dict[str, Any]], after: List[Dict[str, Any]]) -> float:
+    """Estimated prompt tokens after compaction as a fraction of before."""
+    total = sum(estimate_tokens(str(r.get("text") or "")) for r in before)
+    if not total:
+        return 1.0
+    return sum(estimate_tokens(str(r.get("text") or "")) for r in after) / total
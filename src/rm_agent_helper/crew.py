@@ -1,14 +1,117 @@
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task, after_kickoff
+from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List
-import os
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import contextvars
 import json
-from rm_agent_helper.report import generate_html_report
-from rm_agent_helper.job_report import generate_job_match_html_report
-from rm_agent_helper.utils import coerce_result_to_json_text, normalize_candidates_json
-from rm_agent_helper.enrich import load_resume_texts, enrich_candidates
+from concurrent.futures import Future, ThreadPoolExecutor
+from rm_agent_helper.utils import coerce_result
 from rm_agent_helper.tools.custom_tool import ResourceResumeAnalyzerTool, JobProfileLoaderTool
+from rm_agent_helper.tools.extractors import list_resume_files
+from rm_agent_helper.tools.loaders import RESOURCE_RESUME_DIR, load_job_profiles, load_resource_resumes, shared_resumes
+from rm_agent_helper.incremental import load_manifest, merge_incremental, plan_incremental, save_manifest
+from rm_agent_helper.batching import merge_arrays, pack_batches
+from rm_agent_helper.prescore import job_title, score_job_matches, shortlist_payload
+from rm_agent_helper.compact import compact_resumes, compaction_ratio
+from rm_agent_helper.dedup import dedupe_resumes, fan_out_candidates, fan_out_matches
+from rm_agent_helper.validation import (
+    candidate_problems,
+    invalid_candidates,
+    invalid_job_matches,
+    job_match_problems,
+    merge_repairs,
+    retry_budget,
+    retry_rounds,
+)
+from rm_agent_helper.settings import env_flag, env_int, env_str
+from rm_agent_helper.llm import agent_label, agent_llm
+from rm_agent_helper.metrics import observe_tokens, stage_timer
+
+
+def analyse_mode() -> str:
+    """Execution mode for resume analysis: "single" (default) or "batched" (RM_ANALYSE_MODE)."""
+    mode = env_str("RM_ANALYSE_MODE", "single").lower()
+    return mode if mode in ("single", "batched") else "single"
+
+
+def match_per_job() -> bool:
+    """True when job matching makes one LLM call per job (RM_MATCH_PER_JOB)."""
+    return env_flag("RM_MATCH_PER_JOB", False)
+
+
+def match_mode() -> str:
+    """Execution mode for job matching (RM_MATCH_MODE).
+
+    "llm" (default) scores every resume in match_jobs_task; "shortlist" sends only the
+    local BM25 top-K per job to the matcher; "lexical" uses the BM25 scores directly.
+    """
+    mode = env_str("RM_MATCH_MODE", "llm").lower()
+    return mode if mode in ("llm", "shortlist", "lexical") else "llm"
+
+
+def _job_match_entry(data: Any, job_file: str) -> Optional[Dict[str, Any]]:
+    """The one job's {job-file, job-title, matches} from a per-job matcher output, or None if unusable.
+
+    A bare list of match objects is taken as the job's matches.
+    """
+    if isinstance(data, list):
+        entry = next((d for d in data if isinstance(d, dict) and "matches" in d), None)
+        if entry is None and any(isinstance(d, dict) and "resource-file" in d for d in data):
+            entry = {"matches": data}
+        data = entry
+    if not isinstance(data, dict) or not isinstance(data.get("matches"), list):
+        return None
+    matches = []
+    for m in data["matches"]:
+        if not isinstance(m, dict) or not m.get("resource-file"):
+            continue
+        try:
+            percent = max(0, min(100, int(round(float(m.get("percent") or 0)))))
+        except (TypeError, ValueError):
+            percent = 0
+        matches.append({**m, "percent": percent})
+    if data["matches"] and not matches:
+        return None
+    matches.sort(key=lambda m: -m["percent"])
+    return {**data, "job-file": job_file, "matches": matches}
+
+
+def _stage_result(future: "Future[Any]", stage: str) -> Any:
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"Warning: {stage} failed: {e}")
+        return []
+
+
+def _token_totals(agents: List[Any]) -> Dict[int, Tuple[str, int, int, int]]:
+    """Cumulative (label, prompt, completion, requests) token counts per agent."""
+    totals: Dict[int, Tuple[str, int, int, int]] = {}
+    for a in agents or []:
+        label = getattr(getattr(a, "llm", None), "label", None) or agent_label(getattr(a, "role", None))
+        try:
+            summary = getattr(a, "_token_process").get_summary()
+        except Exception:
+            continue
+        totals[id(a)] = (
+            label,
+            int(getattr(summary, "prompt_tokens", 0) or 0),
+            int(getattr(summary, "completion_tokens", 0) or 0),
+            int(getattr(summary, "successful_requests", 0) or 0),
+        )
+    return totals
+
+
+def _record_token_usage(
+    before: Dict[int, Tuple[str, int, int, int]],
+    after: Dict[int, Tuple[str, int, int, int]],
+) -> None:
+    for key, (label, prompt, completion, requests) in after.items():
+        _, prompt0, completion0, requests0 = before.get(key, (label, 0, 0, 0))
+        observe_tokens(label, prompt - prompt0, completion - completion0, requests - requests0)
+
+
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
@@ -31,6 +134,7 @@ class RmAgentHelper():
     def resource_analyser(self) -> Agent:
         return Agent(
             config=self.agents_config['resource_analyser'],  # type: ignore[index]
+            llm=agent_llm(self.agents_config['resource_analyser'], label='resource_analyser'),  # type: ignore[index]
             verbose=True,
             tools=[ResourceResumeAnalyzerTool()],
         )
@@ -39,6 +143,7 @@ class RmAgentHelper():
     def job_matcher(self) -> Agent:
         return Agent(
             config=self.agents_config['job_matcher'],  # type: ignore[index]
+            llm=agent_llm(self.agents_config['job_matcher'], label='job_matcher'),  # type: ignore[index]
             verbose=True,
             tools=[ResourceResumeAnalyzerTool(), JobProfileLoaderTool()],
         )
@@ -68,91 +173,439 @@ class RmAgentHelper():
             # process=Process.hierarchical, # In case you wanna use that instead https://docs.crewai.com/how-to/Hierarchical/
         )
 
-    @after_kickoff
-    def _persist_reports(self, result):
-        def _coerce_to_json_text(result_obj) -> str:
-            try:
-                if isinstance(result_obj, str):
-                    return result_obj
-                if isinstance(result_obj, (list, dict)):
-                    return json.dumps(result_obj)
-                for attr in ["raw", "raw_output", "output", "final_output", "json"]:
-                    if hasattr(result_obj, attr):
-                        value = getattr(result_obj, attr)
-                        if callable(value):
-                            try:
-                                value = value()
-                            except Exception:
-                                continue
-                        if isinstance(value, str):
-                            return value
-                        if isinstance(value, (list, dict)):
-                            return json.dumps(value)
-                if hasattr(result_obj, "to_json") and callable(getattr(result_obj, "to_json")):
-                    try:
-                        return result_obj.to_json()
-                    except Exception:
-                        pass
-                text = str(result_obj).strip()
-                if text.startswith("[") or text.startswith("{"):
-                    return text
-            except Exception:
-                pass
-            return "[]"
-
-        os.makedirs("output", exist_ok=True)
-        output_json = os.path.join("output", "resource_report.json")
-        output_html = os.path.join("output", "resource_report.html")
-        job_match_json = os.path.join("output", "job_match_report.json")
-        job_match_html = os.path.join("output", "job_match_report.html")
-
-        json_text = coerce_result_to_json_text(result)
-        json_text_stripped = (json_text or "").strip()
-        should_overwrite = True
-        if json_text_stripped == "[]" and os.path.exists(output_json):
-            try:
-                if os.path.getsize(output_json) > 2:
-                    should_overwrite = False
-            except Exception:
-                should_overwrite = True
+    def analyse_batch_crew(self) -> Crew:
+        """Standalone crew that analyses one batch of resumes passed in as the `resumes` input.
 
-        try:
-            if should_overwrite:
-                final_json_text = normalize_candidates_json(json_text)
-                # Enrich missing info using simple heuristics
+        Built fresh for every batch so concurrent kickoffs never share agent or task state.
+        """
+        analyser = Agent(
+            config=self.agents_config['resource_analyser'],  # type: ignore[index]
+            llm=agent_llm(self.agents_config['resource_analyser'], label='resource_analyser'),  # type: ignore[index]
+            verbose=False,
+        )
+        batch_task = Task(
+            config=self.tasks_config['analyse_resource_batch_task'],  # type: ignore[index]
+            agent=analyser,
+        )
+        return Crew(agents=[analyser], tasks=[batch_task], process=Process.sequential, verbose=False)
+
+    def analyse_crew(self) -> Crew:
+        """Crew that only runs analyse_resource_task, for use when matching runs separately."""
+        return Crew(
+            agents=[self.resource_analyser()],
+            tasks=[self.analyse_resource_task()],
+            process=Process.sequential,
+            verbose=True,
+        )
+
+    def shortlist_match_crew(self) -> Crew:
+        """Crew that scores a precomputed shortlist passed in as the `shortlist` input."""
+        matcher = Agent(
+            config=self.agents_config['job_matcher'],  # type: ignore[index]
+            llm=agent_llm(self.agents_config['job_matcher'], label='job_matcher'),  # type: ignore[index]
+            verbose=True,
+        )
+        shortlist_task = Task(
+            config=self.tasks_config['match_jobs_shortlist_task'],  # type: ignore[index]
+            agent=matcher,
+        )
+        return Crew(agents=[matcher], tasks=[shortlist_task], process=Process.sequential, verbose=True)
+
+    def match_job_crew(self) -> Crew:
+        """Standalone crew that scores the resumes passed in as `resumes` against the one
+        job passed in as `job`; built fresh per call like analyse_batch_crew."""
+        matcher = Agent(
+            config=self.agents_config['job_matcher'],  # type: ignore[index]
+            llm=agent_llm(self.agents_config['job_matcher'], label='job_matcher'),  # type: ignore[index]
+            verbose=False,
+        )
+        job_task = Task(
+            config=self.tasks_config['match_single_job_task'],  # type: ignore[index]
+            agent=matcher,
+        )
+        return Crew(agents=[matcher], tasks=[job_task], process=Process.sequential, verbose=False)
+
+    def match_crew(self) -> Crew:
+        """Crew that only runs match_jobs_task, for use after a batched analysis."""
+        return Crew(
+            agents=[self.job_matcher()],
+            tasks=[self.match_jobs_task()],
+            process=Process.sequential,
+            verbose=True,
+        )
+
+    def kickoff_instrumented(
+        self, crew_obj: Crew, stage: str, inputs: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Kick off a crew, timing it as ``stage`` and recording per-agent token usage."""
+        before = _token_totals(crew_obj.agents)
+        with stage_timer(stage):
+            result = crew_obj.kickoff(inputs=inputs or {})
+        _record_token_usage(before, _token_totals(crew_obj.agents))
+        return result
+
+    async def kickoff_instrumented_async(
+        self, crew_obj: Crew, stage: str, inputs: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        before = _token_totals(crew_obj.agents)
+        with stage_timer(stage):
+            result = await crew_obj.kickoff_async(inputs=inputs or {})
+        _record_token_usage(before, _token_totals(crew_obj.agents))
+        return result
+
+    async def _analyse_batches_async(self, batches: List[List[dict]], max_concurrency: int) -> List[Any]:
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _analyse(index: int, batch: List[dict]) -> Any:
+            async with semaphore:
                 try:
-                    data = json.loads(final_json_text)
-                    if isinstance(data, list):
-                        texts = load_resume_texts()
-                        data = enrich_candidates(data, texts)
-                        final_json_text = json.dumps(data)
-                except Exception:
-                    pass
-                with open(output_json, "w", encoding="utf-8") as f:
-                    f.write(final_json_text)
-                print(f"Saved consolidated report to {output_json}")
-            else:
-                print(f"Kept existing non-empty report at {output_json}")
-        except Exception as e:
-            print(f"Warning: failed to write JSON report: {e}")
+                    resumes = json.dumps(batch, ensure_ascii=False)
+                    result = await self.kickoff_instrumented_async(
+                        self.analyse_batch_crew(), "llm_analyse_batch", {"resumes": resumes}
+                    )
+                    return coerce_result(result)
+                except Exception as e:
+                    print(f"Warning: resume batch {index + 1}/{len(batches)} failed: {e}")
+                    return []
+
+        return await asyncio.gather(*(_analyse(i, b) for i, b in enumerate(batches)))
+
+    def _analyse_resumes(self, resumes: List[dict], token_budget: int, max_concurrency: int) -> List[dict]:
+        compacted = compact_resumes(resumes)
+        if compacted is not resumes:
+            print(f"Compacted resume text to {compaction_ratio(resumes, compacted):.0%} of its estimated tokens")
+        batches = pack_batches(compacted, token_budget)
+        print(f"Analysing {len(resumes)} resumes in {len(batches)} batches (concurrency {max_concurrency})")
+        return merge_arrays(asyncio.run(self._analyse_batches_async(batches, max_concurrency)))
+
+    def repair_candidates(
+        self,
+        candidates: Any,
+        resumes: List[dict],
+        token_budget: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> Any:
+        """Re-analyse only the resumes whose candidate is missing or invalid and merge the repairs.
+
+        ``resumes`` are the resumes that were analysed (one copy of each duplicate).
+        Invalid resumes are re-queued through the batched path for up to
+        RM_RETRY_ROUNDS rounds, at most RM_RETRY_BUDGET resumes in total; a repair only
+        replaces an entry when it is valid itself. Resumes with no extracted text are
+        never re-queued: another LLM call cannot find expertise in an empty document.
+        """
+        if token_budget is None:
+            token_budget = env_int("RM_ANALYSE_BATCH_TOKENS", 12000, minimum=256)
+        if max_concurrency is None:
+            max_concurrency = env_int("RM_ANALYSE_CONCURRENCY", 4, minimum=1)
+        by_file = {r.get("resource-file"): r for r in resumes}
+        files = [f for f, r in by_file.items() if str(r.get("text") or "").strip()]
+        budget = retry_budget()
+        rounds = retry_rounds()
+
+        invalid = invalid_candidates(candidates, files)
+        for attempt in range(rounds):
+            if not invalid or budget <= 0:
+                break
+            queued = list(invalid)[:budget]
+            budget -= len(queued)
+            print(
+                f"Re-analysing {len(queued)} of {len(invalid)} resumes with invalid results "
+                f"(round {attempt + 1}/{rounds}): " + ", ".join(f"{f} ({invalid[f]})" for f in queued[:5])
+                + (" ..." if len(queued) > 5 else "")
+            )
+            try:
+                repairs = self._analyse_resumes([by_file[f] for f in queued], token_budget, max_concurrency)
+            except Exception as e:
+                print(f"Warning: re-analysis failed: {e}")
+                break
+            wanted = set(queued)
+            repairs = [c for c in repairs if c.get("resource-file") in wanted]
+            candidates = merge_repairs(candidates, repairs, "resource-file", lambda c: not candidate_problems(c))
+            invalid = invalid_candidates(candidates, files)
+        if invalid:
+            print(f"Warning: {len(invalid)} resumes still have missing or invalid results")
+        return candidates
+
+    def analyse_resources_batched(
+        self,
+        token_budget: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        resumes: Optional[List[dict]] = None,
+    ) -> List[dict]:
+        """Map-reduce analysis: bin-pack resumes into token-budgeted batches, analyse the
+        batches concurrently and merge the per-batch arrays into one candidate list.
+        Resumes left with a missing or invalid candidate are then retried on their own.
+
+        Analyses every resume on disk unless ``resumes`` is given.
+        """
+        if token_budget is None:
+            token_budget = env_int("RM_ANALYSE_BATCH_TOKENS", 12000, minimum=256)
+        if max_concurrency is None:
+            max_concurrency = env_int("RM_ANALYSE_CONCURRENCY", 4, minimum=1)
+
+        if resumes is None:
+            resumes = load_resource_resumes()
+        if not resumes:
+            return []
+        unique, groups = dedupe_resumes(resumes)
+        if groups:
+            print(f"Deduplicated {len(resumes)} resumes to {len(unique)} unique")
+        candidates = self._analyse_resumes(unique, token_budget, max_concurrency)
+        candidates = self.repair_candidates(candidates, unique, token_budget, max_concurrency)
+        return fan_out_candidates(candidates, groups)
+
+    def analyse_resources_incremental(self) -> List[dict]:
+        """Analyse only resumes that are new or changed since the last run.
+
+        Per-file fingerprints and their analysed candidates are kept in a manifest next
+        to the report; unchanged files reuse their previous candidate and deleted files
+        drop out. Changed resumes go through the batched analysis path.
+        """
+        resource_files = list_resume_files(RESOURCE_RESUME_DIR)
+        manifest = load_manifest()
+        changed, deleted, fingerprints = plan_incremental(RESOURCE_RESUME_DIR, resource_files, manifest)
+        print(
+            f"Incremental analysis: {len(changed)} new/changed, {len(deleted)} deleted, "
+            f"{len(fingerprints) - len(changed)} unchanged"
+        )
 
+        new_candidates: List[dict] = []
+        if changed:
+            new_candidates = self.analyse_resources_batched(resumes=load_resource_resumes(changed))
+        candidates, updated = merge_incremental(resource_files, manifest, fingerprints, new_candidates)
         try:
-            generate_html_report(output_json, output_html)
-            print(f"Saved HTML report to {output_html}")
+            save_manifest(updated)
         except Exception as e:
-            print(f"Warning: failed to generate HTML report: {e}")
+            print(f"Warning: failed to write incremental manifest: {e}")
+        return candidates
+
+    async def _match_jobs_async(
+        self, payloads: List[Dict[str, str]], max_concurrency: int, retries: int
+    ) -> List[Optional[Dict[str, Any]]]:
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _match(payload: Dict[str, str]) -> Optional[Dict[str, Any]]:
+            job_file = payload["job-file"]
+            for attempt in range(retries + 1):
+                async with semaphore:
+                    try:
+                        result = await self.kickoff_instrumented_async(
+                            self.match_job_crew(), "llm_match_job", {"job": payload["job"], "resumes": payload["resumes"]}
+                        )
+                        # The task answers with one object; prefer it over the matches list inside.
+                        entry = _job_match_entry(coerce_result(result, ("{", "[")), job_file)
+                        if entry is not None:
+                            return entry
+                        problem = "unusable output"
+                    except Exception as e:
+                        problem = str(e)
+                print(f"Warning: matching {job_file} failed (attempt {attempt + 1}/{retries + 1}): {problem}")
+            return None
+
+        return await asyncio.gather(*(_match(p) for p in payloads))
+
+    def match_jobs_per_job(
+        self,
+        shortlist: List[Dict[str, Any]],
+        jobs: List[Dict[str, Any]],
+        resumes: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        retries: Optional[int] = None,
+        fallback: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Fan job matching out to one concurrent LLM call per job and merge the results.
+
+        Each job is scored against the resumes listed for it in ``shortlist`` (a BM25
+        report). A job whose call fails or returns unusable JSON is retried on its own
+        up to ``retries`` times (RM_MATCH_RETRIES, default 1); if it still fails its
+        BM25 entry is used so the report keeps every job, or it is left out when
+        ``fallback`` is False.
+        """
+        if max_concurrency is None:
+            max_concurrency = env_int("RM_MATCH_CONCURRENCY", 4, minimum=1)
+        if retries is None:
+            retries = env_int("RM_MATCH_RETRIES", 1, minimum=0)
+
+        job_texts = {j.get("job-file"): j.get("text", "") for j in jobs}
+        resume_texts = {r.get("resource-file"): r.get("text", "") for r in compact_resumes(resumes)}
+        payloads = []
+        for entry in shortlist:
+            job_file = str(entry.get("job-file") or "")
+            files = [m.get("resource-file") for m in entry.get("matches", [])]
+            payloads.append({
+                "job-file": job_file,
+                "job": json.dumps({"job-file": job_file, "text": job_texts.get(job_file, "")}, ensure_ascii=False),
+                "resumes": json.dumps(
+                    [{"resource-file": f, "text": resume_texts.get(f, "")} for f in files], ensure_ascii=False
+                ),
+            })
+        print(f"Matching {len(payloads)} jobs in per-job calls (concurrency {max_concurrency})")
+        results = asyncio.run(self._match_jobs_async(payloads, max_concurrency, retries))
+
+        merged: List[Dict[str, Any]] = []
+        for entry, result in zip(shortlist, results):
+            if result is None:
+                if not fallback:
+                    continue
+                print(f"Warning: using lexical scores for {entry.get('job-file')}")
+                result = entry
+            elif not result.get("job-title"):
+                result["job-title"] = entry.get("job-title", "")
+            merged.append(result)
+        return merged
+
+    def repair_job_matches(
+        self,
+        report: Any,
+        jobs: List[Dict[str, Any]],
+        resumes: List[Dict[str, Any]],
+        shortlist: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Any]:
+        """Re-score only the jobs whose entry is missing or invalid and merge the repairs.
+
+        Each job must score the resumes ``shortlist`` lists for it, or every resume in
+        ``resumes`` when there is no shortlist. Invalid jobs (at most RM_RETRY_BUDGET)
+        are re-queued as per-job calls with RM_RETRY_ROUNDS attempts each; a job still
+        missing afterwards gets its BM25 entry.
+        """
+        if not isinstance(report, list):
+            report = []
+        if shortlist is not None:
+            expected = {
+                str(e.get("job-file") or ""): [m.get("resource-file") for m in e.get("matches", [])] for e in shortlist
+            }
+            titles = {str(e.get("job-file") or ""): e.get("job-title", "") for e in shortlist}
+        else:
+            files = [r.get("resource-file") for r in resumes]
+            expected = {str(j.get("job-file") or ""): files for j in jobs}
+            titles = {str(j.get("job-file") or ""): job_title(j) for j in jobs}
+        invalid = invalid_job_matches(report, expected)
+        if not invalid:
+            return report
+        budget = retry_budget()
+        rounds = retry_rounds()
+        queued = [
+            {"job-file": f, "job-title": titles[f], "matches": [{"resource-file": r} for r in expected[f]]}
+            for f in expected
+            if f in invalid
+        ][:budget] if rounds else []
+        if queued:
+            print(
+                f"Re-scoring {len(queued)} of {len(invalid)} jobs with invalid results: "
+                + ", ".join(f"{e.get('job-file')} ({invalid[e.get('job-file')]})" for e in queued[:5])
+                + (" ..." if len(queued) > 5 else "")
+            )
+            try:
+                repairs = self.match_jobs_per_job(queued, jobs, resumes, retries=rounds - 1, fallback=False)
+            except Exception as e:
+                print(f"Warning: re-scoring failed: {e}")
+                repairs = []
+            report = merge_repairs(
+                report, repairs, "job-file", lambda e: not job_match_problems(e, expected.get(e.get("job-file")))
+            )
+        # Jobs the LLM never returned are filled from BM25 so the report covers every job;
+        # without a shortlist only those jobs are scored.
+        present = {e.get("job-file") for e in report if isinstance(e, dict)}
+        absent = {f for f in expected if f not in present}
+        missing: List[Dict[str, Any]] = []
+        if absent:
+            print(f"Warning: using lexical scores for {len(absent)} jobs missing from the match output")
+            if shortlist is not None:
+                missing = [e for e in shortlist if e.get("job-file") in absent]
+            else:
+                missing = score_job_matches([j for j in jobs if j.get("job-file") in absent], resumes, 0)
+        still = invalid_job_matches(report, expected)
+        if len(still) > len(missing):
+            print(f"Warning: {len(still) - len(missing)} jobs still have invalid match results")
+        return report + missing
+
+    def run_matching(self, top_k: Optional[int] = None) -> Any:
+        """Run job matching in the configured RM_MATCH_MODE and return the parsed job-match report.
+
+        Jobs the LLM leaves missing or invalid are re-scored on their own (see
+        repair_job_matches), with the BM25 scores as the last fallback. With
+        RM_MATCH_PER_JOB=1 the "llm" and "shortlist" modes make one call per job
+        instead (see match_jobs_per_job).
+        """
+        mode = match_mode()
+        per_job = match_per_job()
+        if mode == "llm" and not per_job:
+            # The matcher's resume tool only returns one copy of duplicate resumes.
+            data = coerce_result(self.kickoff_instrumented(self.match_crew(), "llm_match"))
+            resumes, groups = dedupe_resumes(load_resource_resumes())
+            return fan_out_matches(self.repair_job_matches(data, load_job_profiles(), resumes), groups)
+
+        if mode == "llm":
+            # Every resume goes to every job; BM25 only orders them and is the fallback.
+            top_k = 0
+        elif top_k is None:
+            top_k = env_int("RM_MATCH_TOP_K", 10, minimum=1)
+        jobs = load_job_profiles()
+        resumes, groups = dedupe_resumes(load_resource_resumes())
+        shortlist = score_job_matches(jobs, resumes, top_k)
+        if mode == "lexical" or not shortlist:
+            return fan_out_matches(shortlist, groups)
+        # Duplicate files are only added to results; the LLM sees one copy of each resume.
+        if per_job:
+            return fan_out_matches(self.match_jobs_per_job(shortlist, jobs, resumes), groups)
 
-        # If final output looks like job-match JSON, persist and render HTML
         try:
-            text = coerce_result_to_json_text(result)
-            obj = json.loads(text)
-            if isinstance(obj, list) and obj and isinstance(obj[0], dict) and (
-                ("job-file" in obj[0] or "job_file" in obj[0]) and "matches" in obj[0]
-            ):
-                with open(job_match_json, "w", encoding="utf-8") as f:
-                    json.dump(obj, f, ensure_ascii=False, indent=2)
-                print(f"Saved job match JSON to {job_match_json}")
-                generate_job_match_html_report(job_match_json, job_match_html)
-                print(f"Saved job match HTML to {job_match_html}")
+            payload = json.dumps(shortlist_payload(shortlist, jobs, compact_resumes(resumes)), ensure_ascii=False)
+            result = self.kickoff_instrumented(self.shortlist_match_crew(), "llm_match_shortlist", {"shortlist": payload})
+            data = coerce_result(result)
+            if not data:
+                print("Warning: shortlist matching returned no results")
         except Exception as e:
-            print(f"Warning: failed to persist job match report: {e}")
+            print(f"Warning: shortlist matching failed: {e}")
+            data = []
+        return fan_out_matches(self.repair_job_matches(data, jobs, resumes, shortlist), groups)
+
+    def run_analysis(self) -> Tuple[Any, Any]:
+        """Run the configured analysis and matching modes and return the parsed
+        (resource_data, match_data) outputs.
+
+        With the defaults both come from one run of the sequential crew. Otherwise
+        resumes are analysed on their own (in one call, or via map-reduce in "batched"
+        mode) and matching runs separately in its RM_MATCH_MODE. With RM_CONCURRENT=1
+        the analysis and the matching run at the same time.
+        """
+        incremental = env_flag("RM_INCREMENTAL", False)
+        if env_flag("RM_CONCURRENT", False):
+            return self.run_concurrently(incremental)
+        if analyse_mode() == "single" and match_mode() == "llm" and not incremental:
+            result = self.kickoff_instrumented(self.crew(), "llm_crew")
+            # The final output is the matcher's; the analysis is the first task's output.
+            tasks_output = getattr(result, "tasks_output", None) or []
+            resource_data = coerce_result(tasks_output[0]) if tasks_output else coerce_result(result)
+            resumes, groups = dedupe_resumes(load_resource_resumes())
+            resource_data = self.repair_candidates(resource_data, resumes)
+            match_data = self.repair_job_matches(coerce_result(result), load_job_profiles(), resumes)
+            return fan_out_candidates(resource_data, groups), fan_out_matches(match_data, groups)
+
+        return self.run_analyse_stage(incremental), self.run_matching()
+
+    def run_analyse_stage(self, incremental: bool = False) -> Any:
+        """Analyse resumes in the configured mode and return the parsed candidates."""
+        if incremental:
+            return self.analyse_resources_incremental()
+        if analyse_mode() == "batched":
+            return self.analyse_resources_batched()
+        result = self.kickoff_instrumented(self.analyse_crew(), "llm_analyse")
+        resumes, groups = dedupe_resumes(load_resource_resumes())
+        return fan_out_candidates(self.repair_candidates(coerce_result(result), resumes), groups)
+
+    def run_concurrently(self, incremental: bool = False) -> Tuple[Any, Any]:
+        """Run the analysis and the matching at the same time.
+
+        match_jobs_task never reads the analysis output, so the two only share inputs:
+        the resume folder is extracted once up front and every full load during the
+        run (both stages and their agents' tools) reuses it. Wall-clock time is about
+        that of the slower stage. A stage that fails yields [] so the other's report
+        is still written.
+        """
+        with shared_resumes(), stage_timer("concurrent_run"):
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="rm-stage") as pool:
+                # Each stage runs in a copy of this context so it sees the shared corpus.
+                analysis = pool.submit(contextvars.copy_context().run, self.run_analyse_stage, incremental)
+                matching = pool.submit(contextvars.copy_context().run, self.run_matching)
+                return _stage_result(analysis, "analysis"), _stage_result(matching, "matching")
@@ -0,0 +1,193 @@
+import hashlib
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rm_agent_helper.settings import env_flag, env_float
+
+
+_WORD_RE = re.compile(r"\w+")
+
+SHINGLE_SIZE = 5
+# 128 permutations in 32 bands of 4 rows: pairs at 0.8 Jaccard share a bucket with
+# >99% probability; bucket mates are then checked against the threshold. A couple of
+# edited lines in a one-page resume still leave it around 0.9 similar to the original,
+# while two people filling in the same template usually stay below that.
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.9
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, _MERSENNE_PRIME, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, _MERSENNE_PRIME, size=NUM_PERM).astype(np.uint64)
+
+
+def dedup_enabled() -> bool:
+    return env_flag("RM_DEDUP", True)
+
+
+def near_dedup_enabled() -> bool:
+    # Off by default: merging different people who share a template would drop one of
+    # them from the reports, while exact copies are always safe to merge.
+    return env_flag("RM_DEDUP_NEAR", False)
+
+
+def dedup_threshold() -> float:
+    """Near-duplicate similarity threshold; 1.0 (exact copies only) unless RM_DEDUP_NEAR=1."""
+    if not near_dedup_enabled():
+        return 1.0
+    return min(1.0, max(0.0, env_float("RM_DEDUP_THRESHOLD", DEFAULT_THRESHOLD)))
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall((text or "").lower())
+
+
+def content_hash(words: Sequence[str]) -> str:
+    """Hash of the normalised word sequence: equal for copies that differ only in
+    case, punctuation, whitespace or file format."""
+    return hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest()
+
+
+def minhash(words: Sequence[str]) -> np.ndarray:
+    """MinHash signature over word ``SHINGLE_SIZE``-grams."""
+    if len(words) <= SHINGLE_SIZE:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    hashes = np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) % _MERSENNE_PRIME for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    # (a*x + b) mod p for every permutation × shingle; values stay below 2**62.
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return permuted.min(axis=1)
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def find_duplicates(resumes: List[Dict[str, Any]], threshold: Optional[float] = None) -> Dict[str, List[str]]:
+    """Group resumes whose extracted text is identical or nearly so.
+
+    Returns ``{representative resource-file: [duplicate resource-files]}`` for groups
+    with more than one file. Exact copies are found by content hash; near-duplicates
+    by MinHash signatures bucketed with LSH, confirmed when the estimated Jaccard
+    similarity is at least ``threshold`` (see ``dedup_threshold``). The
+    representative is the file with the most text, so the best extraction of a
+    PDF + DOCX pair is the one analysed. Resumes with no text are never grouped.
+    """
+    if threshold is None:
+        threshold = dedup_threshold()
+    n = len(resumes)
+    parent = list(range(n))
+    words = [_words(str(r.get("text") or "")) for r in resumes]
+
+    by_hash: Dict[str, int] = {}
+    unique: List[int] = []
+    for i, w in enumerate(words):
+        if not w:
+            continue
+        h = content_hash(w)
+        if h in by_hash:
+            parent[_find(parent, i)] = _find(parent, by_hash[h])
+        else:
+            by_hash[h] = i
+            unique.append(i)
+
+    if threshold < 1.0 and len(unique) > 1:
+        signatures = {i: minhash(words[i]) for i in unique}
+        checked: set[Tuple[int, int]] = set()
+        for band in range(BANDS):
+            buckets: Dict[bytes, List[int]] = {}
+            for i in unique:
+                key = signatures[i][band * ROWS:(band + 1) * ROWS].tobytes()
+                buckets.setdefault(key, []).append(i)
+            for members in buckets.values():
+                # Every pair in the bucket is a candidate, not just pairs with its first member.
+                for a, first in enumerate(members):
+                    for j in members[a + 1:]:
+                        if (first, j) in checked or _find(parent, first) == _find(parent, j):
+                            continue
+                        checked.add((first, j))
+                        similarity = float(np.mean(signatures[first] == signatures[j]))
+                        if similarity >= threshold:
+                            parent[_find(parent, j)] = _find(parent, first)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(n):
+        groups.setdefault(_find(parent, i), []).append(i)
+
+    result: Dict[str, List[str]] = {}
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        members.sort(key=lambda i: (-len(words[i]), str(resumes[i].get("resource-file") or "")))
+        files = [str(resumes[i].get("resource-file") or "") for i in members]
+        result[files[0]] = sorted(files[1:])
+    return result
+
+
+def dedupe_resumes(resumes: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+    """Drop duplicate resumes, keeping one representative per group (in input order).
+
+    Returns the unique resumes and the duplicate groups; with RM_DEDUP=0 the input is
+    returned unchanged with no groups.
+    """
+    if not dedup_enabled() or len(resumes) < 2:
+        return resumes, {}
+    groups = find_duplicates(resumes)
+    if not groups:
+        return resumes, {}
+    dropped = {f for duplicates in groups.values() for f in duplicates}
+    unique = [r for r in resumes if r.get("resource-file") not in dropped]
+    return unique, groups
+
+
+def fan_out_candidates(candidates: Any, groups: Dict[str, List[str]]) -> Any:
+    """Copy each representative's analysed candidate to its duplicate files.
+
+    Files that already have a candidate are left alone, so applying it twice is harmless.
+    """
+    if not groups or not isinstance(candidates, list):
+        return candidates
+    present = {c.get("resource-file") for c in candidates if isinstance(c, dict)}
+    out: List[Any] = []
+    for candidate in candidates:
+        out.append(candidate)
+        if not isinstance(candidate, dict):
+            continue
+        for duplicate in groups.get(candidate.get("resource-file") or "", []):
+            if duplicate not in present:
+                out.append({**candidate, "resource-file": duplicate})
+                present.add(duplicate)
+    return out
+
+
+def fan_out_matches(report: Any, groups: Dict[str, List[str]]) -> Any:
+    """Give every duplicate file the same match entry as its representative, per job."""
+    if not groups or not isinstance(report, list):
+        return report
+    for job in report:
+        matches = job.get("matches") if isinstance(job, dict) else None
+        if not isinstance(matches, list):
+            continue
+        present = {m.get("resource-file") for m in matches if isinstance(m, dict)}
+        expanded: List[Any] = []
+        for match in matches:
+            expanded.append(match)
+            if not isinstance(match, dict):
+                continue
+            for duplicate in groups.get(match.get("resource-file") or "", []):
+                if duplicate not in present:
+                    expanded.append({**match, "resource-file": duplicate})
+                    present.add(duplicate)
+        job["matches"] = expanded
+    return report
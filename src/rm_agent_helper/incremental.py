@@ -0,0 +1,112 @@
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from rm_agent_helper.tools.extraction_cache import file_digest
+
+
+MANIFEST_PATH = os.path.join("output", "resource_report.manifest.json")
+MANIFEST_VERSION = 1
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> Dict[str, Dict[str, Any]]:
+    """Load the per-file manifest: {resource-file: {sha256, size, mtime_ns, candidate}}."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_manifest(files: Dict[str, Dict[str, Any]], path: str = MANIFEST_PATH) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "files": files}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def fingerprint(path: str, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Content fingerprint of a file; the hash is reused when size and mtime are unchanged."""
+    st = os.stat(path)
+    if (
+        previous
+        and previous.get("size") == st.st_size
+        and previous.get("mtime_ns") == st.st_mtime_ns
+        and previous.get("sha256")
+    ):
+        sha256 = previous["sha256"]
+    else:
+        sha256 = file_digest(path)
+    return {"sha256": sha256, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def plan_incremental(
+    resource_dir: str,
+    resource_files: List[str],
+    manifest: Dict[str, Dict[str, Any]],
+) -> Tuple[List[str], List[str], Dict[str, Dict[str, Any]]]:
+    """Compare the files on disk with the manifest.
+
+    Returns ``(changed, deleted, fingerprints)``: files that are new or whose content
+    changed (or that have no analysed candidate yet), manifest entries whose files are
+    gone, and the current fingerprint of every file on disk.
+    """
+    changed: List[str] = []
+    fingerprints: Dict[str, Dict[str, Any]] = {}
+    for resource_file in resource_files:
+        previous = manifest.get(resource_file)
+        try:
+            current = fingerprint(os.path.join(resource_dir, resource_file), previous)
+        except Exception:
+            continue
+        fingerprints[resource_file] = current
+        if (
+            not previous
+            or previous.get("sha256") != current["sha256"]
+            or not isinstance(previous.get("candidate"), dict)
+        ):
+            changed.append(resource_file)
+    deleted = [f for f in manifest if f not in fingerprints]
+    return changed, deleted, fingerprints
+
+
+def merge_incremental(
+    resource_files: List[str],
+    manifest: Dict[str, Dict[str, Any]],
+    fingerprints: Dict[str, Dict[str, Any]],
+    new_candidates: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Merge freshly analysed candidates into the manifest's previous results.
+
+    Returns the candidate array in file order and the updated manifest. Deleted
+    files drop out; files the LLM returned no entry for stay out of the manifest so
+    the next run analyses them again.
+    """
+    by_file: Dict[str, Dict[str, Any]] = {}
+    for item in new_candidates:
+        if isinstance(item, dict) and item.get("resource-file") in fingerprints:
+            by_file.setdefault(item["resource-file"], item)
+
+    updated: Dict[str, Dict[str, Any]] = {}
+    candidates: List[Dict[str, Any]] = []
+    for resource_file in resource_files:
+        current = fingerprints.get(resource_file)
+        if current is None:
+            continue
+        candidate = by_file.get(resource_file)
+        if candidate is None:
+            previous = manifest.get(resource_file) or {}
+            if previous.get("sha256") == current["sha256"] and isinstance(previous.get("candidate"), dict):
+                candidate = previous["candidate"]
+        if candidate is None:
+            continue
+        updated[resource_file] = {**current, "candidate": candidate}
+        candidates.append(candidate)
+    return candidates, updated
@@ -1,6 +1,14 @@
-import os
 import json
-from typing import Any, Dict, List
+import os
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+from rm_agent_helper.metrics import timed
+from rm_agent_helper.settings import env_int
+from rm_agent_helper.utils import iter_json_array
+
+
+# Matches rendered inline per job; the rest are embedded as data and drawn on expand.
+DEFAULT_TOP_K = 25
 
 
 def _html_escape(text: str) -> str:
@@ -14,113 +22,64 @@ def _html_escape(text: str) -> str:
     )
 
 
-def generate_job_match_html_report(job_json_input_path: str, html_output_path: str) -> None:
-    os.makedirs(os.path.dirname(html_output_path), exist_ok=True)
-
-    try:
-        with open(job_json_input_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception:
-        data = []
-
-    jobs: List[Dict[str, Any]] = data if isinstance(data, list) else []
-
-    sections: List[str] = []
-    for job in jobs:
-        if not isinstance(job, dict):
-            continue
-        job_title = _html_escape(job.get("job-title") or job.get("job_file") or job.get("job-file") or "Job")
-        matches = job.get("matches") if isinstance(job, dict) else []
-        if not isinstance(matches, list):
-            matches = []
-
-        bars: List[str] = []
-        for m in matches:
-            if not isinstance(m, dict):
-                continue
-            name = _html_escape(m.get("resource-name") or m.get("resource_file") or m.get("resource-file") or "Unknown")
-            try:
-                width = max(0, min(100, int(m.get("percent", 0))))
-            except Exception:
-                width = 0
-            bars.append(
-                f'<div class="bar"><div class="bar-fill" style="width:{width}%"></div><div class="bar-label">{name} — {width}%</div></div>'
-            )
-
-        sections.append(
-            f"""
-            <section class=\"job\">
-              <h3 class=\"job-title\">{job_title}</h3>
-              <div class=\"bars\">{''.join(bars)}</div>
-            </section>
-            """
-        )
-
-    body_html = "\n".join(sections) if sections else '<div class="empty">No job matches found. Ensure job profiles and resumes are present.</div>'
-
-    html = f"""
-<!DOCTYPE html>
-<html lang=\"en\">
-<head>
-  <meta charset=\"UTF-8\" />
-  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
-  <title>Job Match Report</title>
-  <style>
-    :root {{
+_STYLE = """
+    :root {
       --gold: #FFCC00;
       --black: #000000;
       --grey-1: #f7f7f7;
       --grey-2: #eaeaea;
       --grey-3: #8c8c8c;
       --white: #ffffff;
-    }}
-    * {{ box-sizing: border-box; }}
-    body {{
+    }
+    * { box-sizing: border-box; }
+    body {
       margin: 0;
       font-family: -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Helvetica, Arial, sans-serif;
       color: #1f1f1f;
       background: var(--grey-1);
       line-height: 1.5;
-    }}
-    header {{
+    }
+    header {
       background: linear-gradient(90deg, var(--gold), #ffd84d);
       color: var(--black);
       padding: 24px 16px;
       border-bottom: 4px solid var(--black);
-    }}
-    main {{
+    }
+    main {
       max-width: 1000px;
       margin: 24px auto;
       padding: 0 16px 48px;
-    }}
-    .job {{
+    }
+    .job {
       background: var(--white);
       border: 1px solid var(--grey-2);
       border-radius: 10px;
       box-shadow: 0 2px 0 rgba(0,0,0,0.06);
       padding: 16px;
       margin-bottom: 16px;
-    }}
-    .job-title {{
+      content-visibility: auto;
+      contain-intrinsic-size: auto 400px;
+    }
+    .job-title {
       margin: 0 0 12px 0;
       font-size: 18px;
       color: var(--black);
-    }}
-    .bar {{
+    }
+    .bar {
       position: relative;
       background: var(--grey-2);
       border-radius: 8px;
       height: 28px;
       margin: 8px 0;
       overflow: hidden;
-    }}
-    .bar-fill {{
+    }
+    .bar-fill {
       background: var(--gold);
       height: 100%;
       width: 0;
       transition: width 0.6s ease;
-    }}
-    .bar-label {{
+    }
+    .bar-label {
       position: absolute;
       inset: 0;
       display: flex;
@@ -129,36 +88,153 @@ def generate_job_match_html_report(job_json_input_path: str, html_output_path: s
       font-size: 13px;
       color: #1f1f1f;
       font-weight: 600;
-    }}
-    .empty {{
+    }
+    .more summary {
+      cursor: pointer;
+      color: var(--grey-3);
+      font-size: 13px;
+      font-weight: 600;
+      margin-top: 8px;
+    }
+    .empty {
       margin-top: 24px;
       color: var(--grey-3);
       font-style: italic;
-    }}
-  </style>
-  <meta name=\"theme-color\" content=\"#FFCC00\" />
-  <script>
-    window.addEventListener('load', () => {{
-      document.querySelectorAll('.bar-fill').forEach(el => {{
+    }
+"""
+
+# Animates only the inline (top-K) bars; expanded sections are drawn from the embedded
+# data on first toggle, so load time does not grow with the size of the match matrix.
+_SCRIPT = """
+    window.addEventListener('load', () => {
+      document.querySelectorAll('.bars.top .bar-fill').forEach(el => {
         const width = el.style.width;
         el.style.width = '0%';
-        requestAnimationFrame(() => {{ el.style.width = width; }});
-      }});
-    }});
-  </script>
+        requestAnimationFrame(() => { el.style.width = width; });
+      });
+    });
+    document.addEventListener('toggle', (event) => {
+      const details = event.target;
+      if (!details.classList || !details.classList.contains('more') || details.dataset.rendered) return;
+      details.dataset.rendered = '1';
+      const names = JSON.parse(document.getElementById('match-names').textContent);
+      const rows = JSON.parse(document.getElementById('matches-' + details.dataset.job).textContent);
+      const fragment = document.createDocumentFragment();
+      for (const [nameIndex, percent] of rows) {
+        const bar = document.createElement('div');
+        bar.className = 'bar';
+        const fill = document.createElement('div');
+        fill.className = 'bar-fill';
+        fill.style.width = percent + '%';
+        const label = document.createElement('div');
+        label.className = 'bar-label';
+        label.textContent = names[nameIndex] + ' \\u2014 ' + percent + '%';
+        bar.append(fill, label);
+        fragment.append(bar);
+      }
+      details.querySelector('.bars').append(fragment);
+    }, true);
+"""
+
+
+def _percent(match: Dict[str, Any]) -> int:
+    try:
+        return max(0, min(100, int(round(float(match.get("percent") or 0)))))
+    except Exception:
+        return 0
+
+
+def _match_name(match: Dict[str, Any]) -> str:
+    return str(match.get("resource-name") or match.get("resource_file") or match.get("resource-file") or "Unknown")
+
+
+def _render_bar(name: str, width: int) -> str:
+    return (
+        f'<div class="bar"><div class="bar-fill" style="width:{width}%"></div>'
+        f'<div class="bar-label">{_html_escape(name)} — {width}%</div></div>'
+    )
+
+
+def _script_json(value: Any) -> str:
+    # Safe to embed in <script type="application/json">: "</" cannot close the tag.
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+
+def _write_job(
+    f: IO[str], index: int, job: Dict[str, Any], top_k: int, names: Dict[str, int]
+) -> None:
+    job_title = _html_escape(job.get("job-title") or job.get("job_file") or job.get("job-file") or "Job")
+    matches = job.get("matches")
+    rows: List[Tuple[str, int]] = [
+        (_match_name(m), _percent(m)) for m in (matches if isinstance(matches, list) else []) if isinstance(m, dict)
+    ]
+    if top_k:
+        # Stable sort: equal scores keep the order the matcher produced.
+        rows.sort(key=lambda row: -row[1])
+    inline, rest = (rows[:top_k], rows[top_k:]) if top_k else (rows, [])
+
+    f.write(
+        f"""
+            <section class=\"job\">
+              <h3 class=\"job-title\">{job_title}</h3>
+              <div class=\"bars top\">{''.join(_render_bar(name, width) for name, width in inline)}</div>
+"""
+    )
+    if rest:
+        data = [[names.setdefault(name, len(names)), width] for name, width in rest]
+        f.write(
+            f'              <details class="more" data-job="{index}"><summary>Show all {len(rows)} matches</summary>'
+            f'<div class="bars"></div></details>\n'
+            f'              <script type="application/json" id="matches-{index}">{_script_json(data)}</script>\n'
+        )
+    f.write("            </section>\n")
+
+
+@timed("render_job_match_html")
+def generate_job_match_html_report(
+    job_json_input_path: str, html_output_path: str, top_k: Optional[int] = None
+) -> None:
+    """Render the job match report.
+
+    Jobs are streamed from the JSON file and written one section at a time. Each job
+    shows its ``top_k`` best matches inline (RM_REPORT_TOP_K, default 25; 0 renders
+    every match inline as bars). The remaining matches are embedded as compact
+    ``[name index, percent]`` rows, with resource names stored once for the whole
+    report, and are only turned into DOM nodes when the section is expanded.
+    """
+    os.makedirs(os.path.dirname(html_output_path), exist_ok=True)
+    if top_k is None:
+        top_k = env_int("RM_REPORT_TOP_K", DEFAULT_TOP_K, minimum=0)
+
+    names: Dict[str, int] = {}
+    with open(html_output_path, "w", encoding="utf-8") as f:
+        f.write(f"""
+<!DOCTYPE html>
+<html lang=\"en\">
+<head>
+  <meta charset=\"UTF-8\" />
+  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
+  <title>Job Match Report</title>
+  <style>{_STYLE}  </style>
+  <meta name=\"theme-color\" content=\"#FFCC00\" />
+  <script>{_SCRIPT}  </script>
   </head>
   <body>
     <header>
       <div class=\"title\">Job Match Report</div>
     </header>
     <main>
-      {body_html}
-    </main>
+""")
+        written = 0
+        for job in iter_json_array(job_json_input_path):
+            if not isinstance(job, dict):
+                continue
+            _write_job(f, written, job, top_k, names)
+            written += 1
+        if not written:
+            f.write('<div class="empty">No job matches found. Ensure job profiles and resumes are present.</div>\n')
+        f.write(f"""    </main>
+    <script type=\"application/json\" id=\"match-names\">{_script_json(list(names))}</script>
   </body>
   </html>
-  """
-
-    with open(html_output_path, "w", encoding="utf-8") as f:
-        f.write(html)
-
-
+""")
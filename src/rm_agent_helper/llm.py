@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from crewai import LLM
+
+from rm_agent_helper.llm_cache import get_response_cache, response_key
+from rm_agent_helper.metrics import LLM_CALL_SECONDS
+
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+class CachingLLM(LLM):
+    """crewai LLM that serves repeated completions from the persistent response cache.
+
+    Only plain text responses are cached; tool-calling results and failures always go
+    to the provider. Provider calls are timed by the litellm callback installed in
+    ``install_call_timing``; cache hits are timed here under ``cached="true"``.
+    """
+
+    def __init__(self, *args: Any, label: str = "default", **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.label = label
+
+    def call(self, messages: Any, *args: Any, **kwargs: Any) -> Any:
+        cache = get_response_cache()
+        if cache is None:
+            return super().call(messages, *args, **kwargs)
+
+        tools = kwargs.get("tools", args[0] if args else None)
+        key = response_key(
+            self.model,
+            messages,
+            tools=tools,
+            params={
+                "temperature": getattr(self, "temperature", None),
+                "max_tokens": getattr(self, "max_tokens", None),
+                "stop": getattr(self, "stop", None),
+            },
+        )
+        start = time.perf_counter()
+        cached = cache.get(key)
+        if cached is not None:
+            LLM_CALL_SECONDS.labels(self.label, "true").observe(time.perf_counter() - start)
+            return cached
+
+        response = super().call(messages, *args, **kwargs)
+        if isinstance(response, str) and response.strip():
+            cache.put(key, self.model, response)
+        return response
+
+
+# Agent role (whitespace-normalised) -> metrics label, filled in by agent_llm.
+_roles: Dict[str, str] = {}
+_timing_lock = threading.Lock()
+_timing_installed = False
+
+
+def _normalized_role(role: Any) -> str:
+    return " ".join(str(role or "").split())
+
+
+def agent_label(role: Any) -> str:
+    """Metrics label for an agent role: its config key once registered by agent_llm."""
+    role = _normalized_role(role)
+    return _roles.get(role) or role or "default"
+
+
+def _label_for_messages(messages: Any) -> str:
+    # crewai opens every agent prompt with "You are {role}.", which is the only place a
+    # litellm callback can see which agent made the call.
+    first = messages[0] if isinstance(messages, list) and messages else None
+    content = " ".join(str(first.get("content") or "").split()) if isinstance(first, dict) else ""
+    for role, label in _roles.items():
+        if content.startswith(f"You are {role}"):
+            return label
+    return "default"
+
+
+def _observe_call(kwargs: Any, _response: Any, start_time: Any, end_time: Any) -> None:
+    try:
+        seconds = (end_time - start_time).total_seconds()
+        messages = kwargs.get("messages") if isinstance(kwargs, dict) else None
+        LLM_CALL_SECONDS.labels(_label_for_messages(messages), "false").observe(seconds)
+    except Exception:
+        pass
+
+
+def install_call_timing() -> None:
+    """Time every provider call crewai makes through litellm's success and failure
+    callbacks, once per process, whichever LLM the agent ends up using."""
+    global _timing_installed
+    with _timing_lock:
+        if _timing_installed:
+            return
+        try:
+            import litellm
+        except Exception:
+            return
+        litellm.success_callback = [*(litellm.success_callback or []), _observe_call]
+        litellm.failure_callback = [*(litellm.failure_callback or []), _observe_call]
+        _timing_installed = True
+
+
+def _model_name(configured: Any) -> str:
+    if isinstance(configured, str) and configured.strip():
+        return configured.strip()
+    model = getattr(configured, "model", None)
+    if isinstance(model, str) and model.strip():
+        return model.strip()
+    return (
+        os.environ.get("MODEL")
+        or os.environ.get("MODEL_NAME")
+        or os.environ.get("OPENAI_MODEL_NAME")
+        or DEFAULT_MODEL
+    )
+
+
+def agent_llm(agent_config: Optional[dict] = None, label: str = "default") -> Optional[LLM]:
+    """LLM for an agent: a CachingLLM when RM_LLM_CACHE is enabled, otherwise None so
+    crewai falls back to the agent's configured or default model.
+
+    Also registers the agent's role under ``label`` for the call-latency metrics.
+    """
+    role = _normalized_role((agent_config or {}).get("role"))
+    if role:
+        _roles[role] = label
+    install_call_timing()
+    if get_response_cache() is None:
+        return None
+    base_url = os.environ.get("BASE_URL") or os.environ.get("OPENAI_API_BASE") or os.environ.get("OPENAI_BASE_URL")
+    api_base = os.environ.get("API_BASE") or os.environ.get("AZURE_API_BASE")
+    kwargs: dict = {}
+    if base_url:
+        kwargs["base_url"] = base_url
+    if api_base:
+        kwargs["api_base"] = api_base
+    return CachingLLM(model=_model_name((agent_config or {}).get("llm")), label=label, **kwargs)
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from rm_agent_helper.settings import env_flag, env_float, env_str
+
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "llm_responses.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+def response_key(model: str, messages: Any, tools: Any = None, params: Optional[Dict[str, Any]] = None) -> str:
+    """Stable cache key for one completion.
+
+    ``messages`` is the full conversation sent to the model, so tool outputs that were
+    fed back as observations are part of the key along with the prompt itself.
+    """
+    payload = {
+        "model": model,
+        "messages": messages,
+        "tools": tools,
+        "params": params or {},
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed LLM response cache with TTL expiry and LRU size eviction.
+
+    Each operation opens its own short-lived connection, so one cache can be shared
+    by concurrent agents, threads and processes.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _count(self, attr: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + amount)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    row = conn.execute(
+                        "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                        conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        self._count("evictions")
+                        row = None
+                    if row is not None:
+                        conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            finally:
+                conn.close()
+        except Exception:
+            row = None
+
+        if row is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_access) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, model, response, size, now, now),
+                    )
+                    self._evict(conn, now)
+            finally:
+                conn.close()
+        except Exception:
+            pass
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        removed = 0
+        if self.ttl_seconds is not None:
+            removed += conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_bytes:
+            # Walk least recently used first until we are back under budget.
+            excess = total - self.max_bytes
+            victims = []
+            for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+                if excess <= 0:
+                    break
+                victims.append((key,))
+                excess -= size
+            conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+            removed += len(victims)
+        if removed:
+            self._count("evictions", removed)
+
+    def stats(self) -> Dict[str, Any]:
+        entries, total = 0, 0
+        try:
+            conn = self._connect()
+            try:
+                entries, total = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+            finally:
+                conn.close()
+        except Exception:
+            pass
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total,
+        }
+
+    def clear(self) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM responses")
+        finally:
+            conn.close()
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide response cache, or None unless RM_LLM_CACHE is enabled."""
+    global _default_cache
+    if not env_flag("RM_LLM_CACHE", False):
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            ttl_hours = env_float("RM_LLM_CACHE_TTL_HOURS", 168)
+            _default_cache = ResponseCache(
+                env_str("RM_LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+                ttl_seconds=ttl_hours * 3600 if ttl_hours > 0 else None,
+                max_bytes=int(env_float("RM_LLM_CACHE_MAX_MB", 256) * 1024 * 1024),
+            )
+    return _default_cache
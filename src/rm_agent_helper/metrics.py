@@ -0,0 +1,110 @@
+import functools
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Tuple, TypeVar
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+except Exception:  # prometheus_client is optional; metrics become no-ops without it
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+    Counter = Histogram = None  # type: ignore[assignment,misc]
+    generate_latest = None  # type: ignore[assignment]
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Pipeline stages range from milliseconds (normalisation) to minutes (LLM calls).
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+class _NoopMetric:
+    def labels(self, *args: Any, **kwargs: Any) -> "_NoopMetric":
+        return self
+
+    def observe(self, value: float) -> None:
+        pass
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+
+def _histogram(name: str, documentation: str, labels: Tuple[str, ...]) -> Any:
+    if Histogram is None:
+        return _NoopMetric()
+    return Histogram(name, documentation, labels, buckets=_BUCKETS)
+
+
+def _counter(name: str, documentation: str, labels: Tuple[str, ...]) -> Any:
+    if Counter is None:
+        return _NoopMetric()
+    return Counter(name, documentation, labels)
+
+
+STAGE_SECONDS = _histogram(
+    "rm_stage_duration_seconds", "Time spent in each pipeline stage.", ("stage",)
+)
+STAGE_ERRORS = _counter(
+    "rm_stage_errors_total", "Pipeline stage invocations that raised.", ("stage",)
+)
+EXTRACTION_SECONDS = _histogram(
+    "rm_extraction_duration_seconds", "Per-file resume text extraction time.", ("format",)
+)
+EXTRACTION_CACHE = _counter(
+    "rm_extraction_cache_total", "Extraction cache lookups.", ("result",)
+)
+LLM_CALL_SECONDS = _histogram(
+    "rm_llm_call_duration_seconds", "Latency of individual LLM calls per agent.", ("agent", "cached")
+)
+LLM_TOKENS = _counter(
+    "rm_llm_tokens_total", "LLM tokens per agent and direction (in = prompt, out = completion).", ("agent", "direction")
+)
+LLM_REQUESTS = _counter(
+    "rm_llm_requests_total", "Successful LLM requests per agent.", ("agent",)
+)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+
+def timed(stage: str) -> Callable[[F], F]:
+    """Decorator recording the wrapped function's duration under ``stage``."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with stage_timer(stage):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def observe_extraction(path: str, seconds: float) -> None:
+    ext = path.rsplit(".", 1)[-1].lower() if "." in path else "unknown"
+    EXTRACTION_SECONDS.labels(ext).observe(seconds)
+
+
+def observe_tokens(agent: str, prompt_tokens: int, completion_tokens: int, requests: int = 0) -> None:
+    if prompt_tokens:
+        LLM_TOKENS.labels(agent, "in").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(agent, "out").inc(completion_tokens)
+    if requests:
+        LLM_REQUESTS.labels(agent).inc(requests)
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Prometheus text exposition of every metric in this process."""
+    if generate_latest is None:
+        return b"# prometheus_client is not installed\n", CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,195 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from rm_agent_helper.enrich import enrich_candidates
+from rm_agent_helper.job_report import generate_job_match_html_report
+from rm_agent_helper.report import generate_html_report
+from rm_agent_helper.result_store import get_result_store
+from rm_agent_helper.skills import update_skill_index
+from rm_agent_helper.utils import normalize_candidates
+
+
+OUTPUT_DIR = "output"
+
+
+def is_job_match_report(data: Any) -> bool:
+    """True if ``data`` looks like the job matcher's output ([{job-file, matches}, ...])."""
+    return (
+        isinstance(data, list)
+        and bool(data)
+        and isinstance(data[0], dict)
+        and ("job-file" in data[0] or "job_file" in data[0])
+        and "matches" in data[0]
+    )
+
+
+@dataclass
+class RunArtifacts:
+    """Files written by one run's post-processing."""
+
+    output_json: Optional[str] = None
+    output_html: Optional[str] = None
+    html_pages: List[str] = field(default_factory=list)
+    job_match_json: Optional[str] = None
+    job_match_html: Optional[str] = None
+    candidates: Optional[int] = None
+    run_id: Optional[int] = None
+    kept_existing: bool = False
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        written: Dict[str, Any] = {
+            key: value
+            for key, value in (
+                ("output_json", self.output_json),
+                ("output_html", self.output_html),
+                ("job_match_json", self.job_match_json),
+                ("job_match_html", self.job_match_html),
+            )
+            if value
+        }
+        if self.html_pages:
+            written["html_pages"] = len(self.html_pages)
+        if self.candidates is not None:
+            written["candidates"] = self.candidates
+        if self.run_id is not None:
+            written["run_id"] = self.run_id
+        if self.errors:
+            written["errors"] = list(self.errors)
+        return written
+
+
+def _write_resource_report(
+    data: Any, output_json: str, artifacts: RunArtifacts, log: Callable[[str], None]
+) -> Optional[List[dict]]:
+    """Write the normalized, enriched candidates; returns them, or None if the existing report was kept."""
+    # An empty result (e.g. a failed kickoff) must not wipe out a previous good report.
+    if data == [] and os.path.exists(output_json):
+        try:
+            if os.path.getsize(output_json) > 2:
+                artifacts.kept_existing = True
+                artifacts.output_json = output_json
+                log(f"Kept existing non-empty report at {output_json}")
+                return None
+        except Exception:
+            pass
+
+    candidates = normalize_candidates(data)
+    # Enrich with basic heuristics for missing fields. The enrichment needs no resume
+    # texts, so the corpus is not read (or extracted) again here.
+    try:
+        candidates = enrich_candidates(candidates)
+    except Exception:
+        pass
+    with open(output_json, "w", encoding="utf-8") as f:
+        json.dump(candidates, f)
+    artifacts.output_json = output_json
+    artifacts.candidates = len(candidates)
+    log(f"Saved consolidated report to {output_json}")
+    return candidates
+
+
+def render_reports(output_dir: str = OUTPUT_DIR, log: Callable[[str], None] = print) -> RunArtifacts:
+    """Re-render both HTML reports from the JSON a previous run left in ``output_dir``.
+
+    Needs no LLM and never imports crewai, so it is cheap enough to run after editing
+    the JSON or changing the report settings (page size, top-K).
+    """
+    output_json = os.path.join(output_dir, "resource_report.json")
+    output_html = os.path.join(output_dir, "resource_report.html")
+    job_match_json = os.path.join(output_dir, "job_match_report.json")
+    job_match_html = os.path.join(output_dir, "job_match_report.html")
+    artifacts = RunArtifacts()
+
+    for json_path, html_path, render, kind in (
+        (output_json, output_html, generate_html_report, "resource"),
+        (job_match_json, job_match_html, generate_job_match_html_report, "job match"),
+    ):
+        if not os.path.exists(json_path):
+            log(f"No {kind} report at {json_path}; skipping")
+            continue
+        try:
+            written = render(json_path, html_path)
+        except Exception as e:
+            artifacts.errors.append(f"{kind}: {e}")
+            log(f"Warning: failed to render {html_path}: {e}")
+            continue
+        if kind == "resource":
+            artifacts.output_json, artifacts.output_html = json_path, html_path
+            artifacts.html_pages = list(written[1:])
+        else:
+            artifacts.job_match_json, artifacts.job_match_html = json_path, html_path
+        log(f"Saved {kind} HTML to {html_path}")
+    return artifacts
+
+
+def process_outputs(
+    resource_data: Any,
+    match_data: Any,
+    output_dir: str = OUTPUT_DIR,
+    log: Callable[[str], None] = print,
+) -> RunArtifacts:
+    """Turn one run's parsed outputs into report files, exactly once.
+
+    Stages: normalize + enrich + write the resource JSON, render its HTML, write and
+    render the job match report if ``match_data`` is one, update the skill index, then
+    record the run in the result store. Each stage is attempted even if an earlier one
+    failed; failures are logged and listed in ``errors``.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    output_json = os.path.join(output_dir, "resource_report.json")
+    output_html = os.path.join(output_dir, "resource_report.html")
+    job_match_json = os.path.join(output_dir, "job_match_report.json")
+    job_match_html = os.path.join(output_dir, "job_match_report.html")
+    artifacts = RunArtifacts()
+
+    candidates: Optional[List[dict]] = None
+    try:
+        candidates = _write_resource_report(resource_data, output_json, artifacts, log)
+    except Exception as e:
+        artifacts.errors.append(f"resource_json: {e}")
+        log(f"Warning: failed to write JSON report: {e}")
+
+    try:
+        written = generate_html_report(output_json, output_html)
+        artifacts.output_html = output_html
+        artifacts.html_pages = list(written[1:])
+        log(f"Saved HTML report to {output_html}")
+    except Exception as e:
+        artifacts.errors.append(f"resource_html: {e}")
+        log(f"Warning: failed to generate HTML report: {e}")
+
+    if is_job_match_report(match_data):
+        try:
+            with open(job_match_json, "w", encoding="utf-8") as f:
+                json.dump(match_data, f, ensure_ascii=False, indent=2)
+            artifacts.job_match_json = job_match_json
+            log(f"Saved job match JSON to {job_match_json}")
+            generate_job_match_html_report(job_match_json, job_match_html)
+            artifacts.job_match_html = job_match_html
+            log(f"Saved job match HTML to {job_match_html}")
+        except Exception as e:
+            artifacts.errors.append(f"job_match: {e}")
+            log(f"Warning: failed to persist job match report: {e}")
+
+    if candidates is not None:
+        try:
+            added, updated, removed = update_skill_index(candidates)
+            log(f"Updated skill index: {added} added, {updated} updated, {removed} removed")
+        except Exception as e:
+            artifacts.errors.append(f"skill_index: {e}")
+            log(f"Warning: failed to update the skill index: {e}")
+
+    try:
+        store = get_result_store()
+        job_matches = match_data if is_job_match_report(match_data) else None
+        if store is not None and (candidates is not None or job_matches is not None):
+            artifacts.run_id = store.record_run(candidates, job_matches)
+            log(f"Recorded run {artifacts.run_id} in {store.path}")
+    except Exception as e:
+        artifacts.errors.append(f"result_store: {e}")
+        log(f"Warning: failed to record run in the result store: {e}")
+
+    return artifacts
@@ -0,0 +1,256 @@
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rm_agent_helper.utils import _guess_name_from_filename
+from rm_agent_helper.tools.loaders import load_job_profiles, load_resource_resumes
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+# Small stop list: job descriptions are long prose and these words carry no signal.
+_STOP_WORDS = frozenset(
+    """
+    a about above after all also an and any are as at be been being both but by can could
+    did do does doing for from had has have having he her here his how i if in into is it
+    its just may me more most must my no nor not of on once only or other our out over own
+    per same she should so some such than that the their them then there these they this
+    those through to too under until up very was we were what when where which while who
+    whom why will with within would you your yours role team work working experience ability
+    strong skills years year including etc
+    """.split()
+)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# The score that reads as 100% for a job is its best resume's score, but never less than
+# this share of the theoretical maximum, so a corpus whose best resume only shares a word
+# or two with the job does not report it as a perfect match.
+REFERENCE_FLOOR = 0.01
+# Resumes are scored in chunks so the dense resume×term block stays small.
+_RESUME_CHUNK = 1024
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOP_WORDS]
+
+
+def bm25_matrix(job_texts: Sequence[str], resume_texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Score every job (as the query) against every resume (as the document) with BM25.
+
+    Returns a ``len(job_texts) × len(resume_texts)`` float32 score matrix and, per job,
+    the highest score any resume could reach (every job term present with saturated
+    term frequency). The vocabulary is restricted to terms that occur in some job, so
+    the work is one product of a resume×term BM25 weight block with a term×job query
+    block per resume chunk.
+    """
+    n_jobs, n_resumes = len(job_texts), len(resume_texts)
+    empty = (np.zeros((n_jobs, n_resumes), dtype=np.float32), np.zeros(n_jobs, dtype=np.float32))
+    if not n_jobs or not n_resumes:
+        return empty
+
+    vocab: Dict[str, int] = {}
+    job_terms: List[List[int]] = []
+    for text in job_texts:
+        ids = {vocab.setdefault(t, len(vocab)) for t in tokenize(text)}
+        job_terms.append(sorted(ids))
+    if not vocab:
+        return empty
+
+    query = np.zeros((len(vocab), n_jobs), dtype=np.float32)
+    for j, ids in enumerate(job_terms):
+        query[ids, j] = 1.0
+
+    # Per-resume term ids (restricted to the job vocabulary) and document lengths.
+    doc_terms: List[np.ndarray] = []
+    doc_lens = np.zeros(n_resumes, dtype=np.float32)
+    df = np.zeros(len(vocab), dtype=np.float32)
+    for i, text in enumerate(resume_texts):
+        tokens = tokenize(text)
+        doc_lens[i] = len(tokens)
+        ids = np.fromiter((vocab[t] for t in tokens if t in vocab), dtype=np.int64)
+        doc_terms.append(ids)
+        if ids.size:
+            df[np.unique(ids)] += 1.0
+
+    avgdl = float(doc_lens.mean()) or 1.0
+    idf = np.log1p((n_resumes - df + 0.5) / (df + 0.5)).astype(np.float32)
+    query *= idf[:, None]
+
+    scores = np.zeros((n_jobs, n_resumes), dtype=np.float32)
+    for start in range(0, n_resumes, _RESUME_CHUNK):
+        stop = min(start + _RESUME_CHUNK, n_resumes)
+        tf = np.zeros((stop - start, len(vocab)), dtype=np.float32)
+        for row, ids in enumerate(doc_terms[start:stop]):
+            if ids.size:
+                np.add.at(tf[row], ids, 1.0)
+        norm = BM25_K1 * (1.0 - BM25_B + BM25_B * doc_lens[start:stop] / avgdl)
+        weights = tf * (BM25_K1 + 1.0) / (tf + norm[:, None])
+        scores[:, start:stop] = (weights @ query).T
+    return scores, query.sum(axis=0) * (BM25_K1 + 1.0)
+
+
+def job_title(job: Dict[str, Any]) -> str:
+    for line in str(job.get("text") or "").splitlines():
+        if line.strip():
+            return line.strip()[:120]
+    return str(job.get("job-file") or "")
+
+
+def resource_name(resume: Dict[str, Any]) -> str:
+    return _guess_name_from_filename(str(resume.get("resource-file") or ""))
+
+
+def reference_score(best: float, upper: float) -> float:
+    """Score that maps to 100% for a job whose best resume scores ``best``."""
+    return max(float(best), REFERENCE_FLOOR * float(upper))
+
+
+def percent_of(score: float, reference: float) -> int:
+    return max(0, min(100, int(round(100.0 * float(score) / (reference or 1.0)))))
+
+
+def top_indices(row: np.ndarray, top_k: Optional[int] = None) -> List[int]:
+    """Indices of the ``top_k`` highest scores (all when top_k is falsy), best first."""
+    n = len(row)
+    k = n if not top_k or top_k <= 0 else min(top_k, n)
+    if k < n:
+        top = np.argpartition(-row, k - 1)[:k]
+    else:
+        top = np.arange(n)
+    return sorted(top.tolist(), key=lambda i: (-float(row[i]), i))
+
+
+def score_job_matches(
+    jobs: List[Dict[str, Any]],
+    resumes: List[Dict[str, Any]],
+    top_k: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Build a job-match report from local BM25 scores, keeping the top-K resumes per job.
+
+    Each match carries the raw BM25 ``score`` plus a ``percent`` normalised per job: the
+    score as a share of the job's best resume score (see ``reference_score``). Raw BM25
+    scores have no fixed scale; against the theoretical maximum (every job term present)
+    real resumes score only a few percent.
+    """
+    scores, bounds = bm25_matrix([str(j.get("text") or "") for j in jobs], [str(r.get("text") or "") for r in resumes])
+
+    report: List[Dict[str, Any]] = []
+    for j, job in enumerate(jobs):
+        row = scores[j]
+        reference = reference_score(float(row.max()) if row.size else 0.0, float(bounds[j]))
+        matches = [
+            {
+                "resource-file": resumes[i].get("resource-file", ""),
+                "resource-name": resource_name(resumes[i]),
+                "percent": percent_of(row[i], reference),
+                "score": round(float(row[i]), 4),
+            }
+            for i in top_indices(row, top_k)
+        ]
+        report.append({"job-file": job.get("job-file", ""), "job-title": job_title(job), "matches": matches})
+    return report
+
+
+class ResumeIndex:
+    """In-memory BM25 inverted index over a resume corpus for single-query lookups.
+
+    Built once per corpus; scoring one job against every resume then only touches the
+    postings of that job's terms, and one resume can be scored against any number of
+    jobs using the corpus-wide term statistics.
+    """
+
+    def __init__(self, resumes: List[Dict[str, Any]]) -> None:
+        self.resumes = resumes
+        self.n = len(resumes)
+        postings: Dict[str, Dict[int, int]] = {}
+        self.doc_lens = np.zeros(self.n, dtype=np.float32)
+        for i, resume in enumerate(resumes):
+            tokens = tokenize(str(resume.get("text") or ""))
+            self.doc_lens[i] = len(tokens)
+            for token in tokens:
+                doc_counts = postings.setdefault(token, {})
+                doc_counts[i] = doc_counts.get(i, 0) + 1
+        self.avgdl = float(self.doc_lens.mean()) if self.n else 1.0
+        self.avgdl = self.avgdl or 1.0
+        self._postings = {
+            term: (np.fromiter(counts.keys(), dtype=np.int64), np.fromiter(counts.values(), dtype=np.float32))
+            for term, counts in postings.items()
+        }
+        self._references: Dict[str, float] = {}
+
+    def idf(self, term: str) -> float:
+        entry = self._postings.get(term)
+        df = len(entry[0]) if entry is not None else 0
+        return float(np.log1p((self.n - df + 0.5) / (df + 0.5)))
+
+    def upper_bound(self, query_text: str) -> float:
+        return sum(self.idf(t) for t in set(tokenize(query_text))) * (BM25_K1 + 1.0)
+
+    def reference(self, query_text: str) -> float:
+        """Score that maps to 100% for a query (see ``reference_score``), memoised per query."""
+        reference = self._references.get(query_text)
+        if reference is None:
+            scores = self.score_query(query_text)
+            best = float(scores.max()) if scores.size else 0.0
+            reference = self._references[query_text] = reference_score(best, self.upper_bound(query_text))
+        return reference
+
+    def score_query(self, query_text: str) -> np.ndarray:
+        """BM25 score of every resume in the corpus for one query (e.g. a job)."""
+        scores = np.zeros(self.n, dtype=np.float32)
+        for term in set(tokenize(query_text)):
+            entry = self._postings.get(term)
+            if entry is None:
+                continue
+            docs, tf = entry
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * self.doc_lens[docs] / self.avgdl)
+            scores[docs] += self.idf(term) * tf * (BM25_K1 + 1.0) / (tf + norm)
+        return scores
+
+    def score_document(self, document_text: str, query_texts: Sequence[str]) -> np.ndarray:
+        """BM25 score of one resume against several queries, using corpus term statistics."""
+        counts: Dict[str, int] = {}
+        tokens = tokenize(document_text)
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        norm = BM25_K1 * (1.0 - BM25_B + BM25_B * len(tokens) / self.avgdl)
+        scores = np.zeros(len(query_texts), dtype=np.float32)
+        for q, query_text in enumerate(query_texts):
+            total = 0.0
+            for term in set(tokenize(query_text)):
+                tf = counts.get(term)
+                if tf:
+                    total += self.idf(term) * tf * (BM25_K1 + 1.0) / (tf + norm)
+            scores[q] = total
+        return scores
+
+
+def prescore_job_matches(top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Score every job profile against every resume on disk without calling an LLM."""
+    return score_job_matches(load_job_profiles(), load_resource_resumes(), top_k)
+
+
+def shortlist_payload(
+    shortlist: List[Dict[str, Any]],
+    jobs: List[Dict[str, Any]],
+    resumes: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Compact matcher input: each job with its shortlisted files, plus each shortlisted resume's text once."""
+    job_texts = {j.get("job-file"): j.get("text", "") for j in jobs}
+    resume_texts = {r.get("resource-file"): r.get("text", "") for r in resumes}
+    wanted: Dict[str, None] = {}
+    payload_jobs = []
+    for entry in shortlist:
+        files = [m.get("resource-file") for m in entry.get("matches", [])]
+        wanted.update(dict.fromkeys(files))
+        payload_jobs.append({
+            "job-file": entry.get("job-file"),
+            "text": job_texts.get(entry.get("job-file"), ""),
+            "candidates": files,
+        })
+    return {
+        "jobs": payload_jobs,
+        "resumes": [{"resource-file": f, "text": resume_texts.get(f, "")} for f in wanted],
+    }
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from rm_agent_helper.prescore import ResumeIndex, job_title, percent_of, reference_score, resource_name, top_indices
+from rm_agent_helper.tools.loaders import (
+    JOB_PROFILE_DIR,
+    RESOURCE_RESUME_DIR,
+    load_job_profiles,
+    load_resource_resumes,
+)
+
+
+RESOURCE_REPORT_JSON = os.path.join("output", "resource_report.json")
+
+_lock = threading.Lock()
+_memo: Dict[str, Tuple[Any, Any]] = {}
+
+
+def _listing_key(directory: str) -> Tuple[Tuple[str, int, int], ...]:
+    entries = []
+    try:
+        for name in sorted(os.listdir(directory)):
+            try:
+                st = os.stat(os.path.join(directory, name))
+            except Exception:
+                continue
+            entries.append((name, st.st_size, st.st_mtime_ns))
+    except Exception:
+        pass
+    return tuple(entries)
+
+
+def _memoized(name: str, key: Any, build) -> Any:
+    """Return the value cached under ``name`` while ``key`` is unchanged, rebuilding otherwise."""
+    with _lock:
+        cached = _memo.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+    value = build()
+    with _lock:
+        _memo[name] = (key, value)
+    return value
+
+
+def resume_index() -> ResumeIndex:
+    """BM25 index over the resume corpus, rebuilt only when the resume folder changes."""
+    key = _listing_key(RESOURCE_RESUME_DIR)
+    return _memoized("resumes", key, lambda: ResumeIndex(load_resource_resumes()))
+
+
+def job_profiles() -> List[Dict[str, Any]]:
+    key = _listing_key(JOB_PROFILE_DIR)
+    return _memoized("jobs", key, load_job_profiles)
+
+
+def known_candidates() -> Dict[str, Dict[str, Any]]:
+    """Analysed candidates from the last run's resource report, keyed by resource-file."""
+    try:
+        key = os.stat(RESOURCE_REPORT_JSON).st_mtime_ns
+    except Exception:
+        return {}
+
+    def _load() -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(RESOURCE_REPORT_JSON, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return {}
+        if not isinstance(data, list):
+            return {}
+        return {
+            item["resource-file"]: item
+            for item in data
+            if isinstance(item, dict) and item.get("resource-file")
+        }
+
+    return _memoized("candidates", key, _load)
+
+
+def _candidate_name(resource_file: str, candidates: Dict[str, Dict[str, Any]]) -> str:
+    name = (candidates.get(resource_file) or {}).get("resource-name")
+    if isinstance(name, str) and name.strip() and name != "Unknown":
+        return name
+    return resource_name({"resource-file": resource_file})
+
+
+def find_resume(resource_file: str) -> Optional[Dict[str, Any]]:
+    for resume in resume_index().resumes:
+        if resume.get("resource-file") == resource_file:
+            return resume
+    return None
+
+
+def find_job(job_file: str) -> Optional[Dict[str, Any]]:
+    for job in job_profiles():
+        if job.get("job-file") == job_file:
+            return job
+    return None
+
+
+def match_resume_to_jobs(text: str, resource_file: str = "", top_k: Optional[int] = None) -> Dict[str, Any]:
+    """Score one resume against every job profile with the local BM25 scorer."""
+    jobs = job_profiles()
+    index = resume_index()
+    job_texts = [str(job.get("text") or "") for job in jobs]
+    scores = index.score_document(text, job_texts)
+    matches = [
+        {
+            "job-file": jobs[j].get("job-file", ""),
+            "job-title": job_title(jobs[j]),
+            "percent": percent_of(scores[j], index.reference(job_texts[j])),
+            "score": round(float(scores[j]), 4),
+        }
+        for j in top_indices(scores, top_k)
+    ]
+    candidate = known_candidates().get(resource_file) if resource_file else None
+    return {
+        "resource-file": resource_file,
+        "resource-name": _candidate_name(resource_file, known_candidates()) if resource_file else "",
+        "candidate": candidate,
+        "matches": matches,
+    }
+
+
+def match_job_to_resumes(text: str, job_file: str = "", top_k: Optional[int] = None) -> Dict[str, Any]:
+    """Score one job against every resume with the local BM25 index."""
+    index = resume_index()
+    candidates = known_candidates()
+    scores = index.score_query(text)
+    reference = reference_score(float(scores.max()) if scores.size else 0.0, index.upper_bound(text))
+    matches = []
+    for i in top_indices(scores, top_k):
+        resource_file = index.resumes[i].get("resource-file", "")
+        matches.append({
+            "resource-file": resource_file,
+            "resource-name": _candidate_name(resource_file, candidates),
+            "percent": percent_of(scores[i], reference),
+            "score": round(float(scores[i]), 4),
+        })
+    return {
+        "job-file": job_file,
+        "job-title": job_title({"job-file": job_file, "text": text}),
+        "matches": matches,
+    }
@@ -1,6 +1,15 @@
-import json
+import glob
+import itertools
 import os
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+from rm_agent_helper.metrics import timed
+from rm_agent_helper.settings import env_int
+from rm_agent_helper.utils import iter_json_array
+
+
+# Candidates per HTML page; larger reports are split into pages plus an index.
+DEFAULT_PAGE_SIZE = 1000
 
 
 def _html_escape(text: str) -> str:
@@ -54,52 +63,10 @@ def _render_candidate_card(candidate: Dict[str, Any]) -> str:
     """
 
 
-def generate_html_report(json_input_path: str, html_output_path: str) -> None:
-    os.makedirs(os.path.dirname(html_output_path), exist_ok=True)
-
-    try:
-        with open(json_input_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception:
-        data = []
-
-    # Normalize: accept either the final structured array or raw tool output
-    candidates: List[Dict[str, Any]]
-    if isinstance(data, list) and data and isinstance(data[0], dict) and (
-        "resource-name" in data[0] or "experties" in data[0]
-    ):
-        candidates = data  # Already structured
-    elif isinstance(data, list) and data and isinstance(data[0], dict) and (
-        "resource-file" in data[0] and "text" in data[0]
-    ):
-        # Fallback: show files even if the analysis didn't run
-        candidates = [
-            {
-                "resource-name": os.path.splitext(item.get("resource-file", "Unknown"))[0],
-                "resource-job-title": "",
-                "experties": [],
-                "resource-file": item.get("resource-file", ""),
-            }
-            for item in data
-        ]
-    else:
-        candidates = []
-
-    total = len(candidates)
-
-    cards_html = "\n".join(_render_candidate_card(c) for c in candidates)
-
-    # CBA-inspired palette (gold/black with neutrals)
-    # --cba-gold: #FFCC00; --cba-black: #000000; greys for backgrounds and borders
-    html = f"""
-<!DOCTYPE html>
-<html lang=\"en\">
-<head>
-  <meta charset=\"UTF-8\" />
-  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
-  <title>Resource Report</title>
-  <style>
-    :root {{
+# CBA-inspired palette (gold/black with neutrals)
+# --cba-gold: #FFCC00; --cba-black: #000000; greys for backgrounds and borders
+_STYLE = """
+    :root {
       --cba-gold: #FFCC00;
       --cba-black: #000000;
       --cba-dark: #1f1f1f;
@@ -107,115 +74,309 @@ def generate_html_report(json_input_path: str, html_output_path: str) -> None:
       --cba-grey-2: #eaeaea;
       --cba-grey-3: #8c8c8c;
       --cba-white: #ffffff;
-    }}
-    * {{ box-sizing: border-box; }}
-    body {{
+    }
+    * { box-sizing: border-box; }
+    body {
       margin: 0;
       font-family: -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Helvetica, Arial, sans-serif;
       color: var(--cba-dark);
       background: var(--cba-grey-1);
       line-height: 1.5;
-    }}
-    header {{
+    }
+    header {
       background: linear-gradient(90deg, var(--cba-gold), #ffd84d);
       color: var(--cba-black);
       padding: 24px 16px;
       border-bottom: 4px solid var(--cba-black);
-    }}
-    header .title {{
+    }
+    header .title {
       display: flex;
       align-items: center;
       gap: 12px;
       font-size: 20px;
       font-weight: 700;
-    }}
-    header .count {{
+    }
+    header .count {
       margin-top: 4px;
       color: var(--cba-black);
       opacity: 0.85;
       font-weight: 600;
-    }}
-    main {{
+    }
+    main {
       max-width: 1100px;
       margin: 24px auto;
       padding: 0 16px 48px;
-    }}
-    .grid {{
+    }
+    .grid {
       display: grid;
       grid-template-columns: repeat(auto-fill, minmax(280px, 1fr));
       gap: 16px;
-    }}
-    .card {{
+    }
+    .card {
       background: var(--cba-white);
       border: 1px solid var(--cba-grey-2);
       border-radius: 10px;
       box-shadow: 0 2px 0 rgba(0,0,0,0.06);
       padding: 16px;
-    }}
-    .card-header {{
+      content-visibility: auto;
+      contain-intrinsic-size: 280px 160px;
+    }
+    .card-header {
       border-left: 6px solid var(--cba-gold);
       padding-left: 12px;
       margin-bottom: 12px;
-    }}
-    .name {{
+    }
+    .name {
       margin: 0 0 2px 0;
       font-size: 18px;
       color: var(--cba-black);
-    }}
-    .title {{
+    }
+    .title {
       font-size: 14px;
       color: var(--cba-dark);
       opacity: 0.9;
-    }}
-    .meta {{
+    }
+    .meta {
       margin-top: 6px;
       font-size: 12px;
       color: var(--cba-grey-3);
-    }}
-    .skills {{
+    }
+    .skills {
       display: flex;
       flex-wrap: wrap;
       gap: 8px;
-    }}
-    .badge {{
+    }
+    .badge {
       background: var(--cba-grey-1);
       border: 1px solid var(--cba-grey-2);
       border-radius: 999px;
       padding: 6px 10px;
       font-size: 12px;
       color: var(--cba-dark);
-    }}
-    footer {{
+    }
+    nav.pager {
+      display: flex;
+      justify-content: space-between;
+      margin: 0 0 16px 0;
+      font-size: 14px;
+    }
+    nav.pager a, .pages a {
+      color: var(--cba-black);
+      font-weight: 600;
+    }
+    .pages {
+      background: var(--cba-white);
+      border: 1px solid var(--cba-grey-2);
+      border-radius: 10px;
+      padding: 8px 16px;
+      list-style: none;
+    }
+    .pages li {
+      padding: 6px 0;
+      border-bottom: 1px solid var(--cba-grey-2);
+    }
+    .pages li:last-child { border-bottom: none; }
+    .pages .range {
+      color: var(--cba-grey-3);
+      font-size: 12px;
+      margin-left: 8px;
+    }
+    footer {
       text-align: center;
       color: var(--cba-grey-3);
       font-size: 12px;
       padding: 24px 16px;
-    }}
-    .empty {{
+    }
+    .empty {
       margin-top: 24px;
       color: var(--cba-grey-3);
       font-style: italic;
-    }}
-  </style>
+    }
+"""
+
+
+_EMPTY_HTML = '    <div class="empty">No candidates found. Ensure resumes are present and analysis has run.</div>\n'
+
+
+def _plural(n: int) -> str:
+    return f"{n} candidate{'' if n == 1 else 's'}"
+
+
+def _write_page_start(f: IO[str], heading: str, count_text: str) -> None:
+    f.write(f"""
+<!DOCTYPE html>
+<html lang=\"en\">
+<head>
+  <meta charset=\"UTF-8\" />
+  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
+  <title>{_html_escape(heading)}</title>
+  <style>{_STYLE}  </style>
   <meta name=\"theme-color\" content=\"#FFCC00\" />
 </head>
 <body>
   <header>
-    <div class=\"title\">Resource Report</div>
-    <div class=\"count\">{total} candidate{'' if total == 1 else 's'}</div>
+    <div class=\"title\">{_html_escape(heading)}</div>
+    <div class=\"count\">{_html_escape(count_text)}</div>
   </header>
   <main>
-    {'' if total else '<div class="empty">No candidates found. Ensure resumes are present and analysis has run.</div>'}
-    <section class=\"grid\">
-      {cards_html}
-    </section>
+""")
+
+
+def _write_page_end(f: IO[str]) -> None:
+    f.write("""
   </main>
   <footer>Generated by rm_agent_helper</footer>
   </body>
 </html>
-"""
+""")
 
-    with open(html_output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+
+def _candidate_name(candidate: Dict[str, Any]) -> str:
+    return str(candidate.get("resource-name") or candidate.get("name") or "")
+
+
+def _write_cards(f: IO[str], candidates: Iterable[Dict[str, Any]]) -> None:
+    f.write('    <section class="grid">\n')
+    for candidate in candidates:
+        f.write(_render_candidate_card(candidate))
+    f.write("    </section>\n")
+
+
+def _pager(prev_href: Optional[str], index_href: str, next_href: Optional[str]) -> str:
+    prev_link = f'<a href="{prev_href}">&larr; Previous</a>' if prev_href else "<span></span>"
+    next_link = f'<a href="{next_href}">Next &rarr;</a>' if next_href else "<span></span>"
+    return f'    <nav class="pager">{prev_link}<a href="{index_href}">All pages</a>{next_link}</nav>\n'
+
+
+def _file_only_candidate(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "resource-name": os.path.splitext(item.get("resource-file", "Unknown"))[0],
+        "resource-job-title": "",
+        "experties": [],
+        "resource-file": item.get("resource-file", ""),
+    }
+
+
+def iter_candidates(json_input_path: str) -> Iterator[Dict[str, Any]]:
+    """Stream candidates from the report JSON without loading the whole file."""
+    items = iter_json_array(json_input_path)
+    first = next(items, None)
+    if not isinstance(first, dict):
+        return
+    # Normalize: accept either the final structured array or raw tool output
+    if "resource-name" in first or "experties" in first:
+        convert = None  # Already structured
+    elif "resource-file" in first and "text" in first:
+        # Fallback: show files even if the analysis didn't run
+        convert = _file_only_candidate
+    else:
+        return
+    for item in itertools.chain([first], items):
+        if isinstance(item, dict):
+            yield convert(item) if convert else item
 
 
+def _pages_dir(html_output_path: str) -> str:
+    return os.path.splitext(html_output_path)[0] + "_pages"
+
+
+def _remove_stale_pages(pages_dir: str) -> None:
+    for path in glob.glob(os.path.join(pages_dir, "page-*.html")):
+        try:
+            os.remove(path)
+        except Exception:
+            pass
+
+
+@timed("render_resource_html")
+def generate_html_report(
+    json_input_path: str, html_output_path: str, page_size: Optional[int] = None
+) -> List[str]:
+    """Render the resource report and return the HTML files written.
+
+    Candidates are streamed from the JSON file and each card is written to disk as it
+    is rendered, so memory is bounded by one page rather than the whole report.
+    Reports with more than ``page_size`` candidates (RM_REPORT_PAGE_SIZE, default
+    1000; 0 keeps everything on one page) are split into
+    ``<name>_pages/page-NNNN.html`` files, and ``html_output_path`` becomes an index
+    linking to them.
+    """
+    os.makedirs(os.path.dirname(html_output_path), exist_ok=True)
+    if page_size is None:
+        page_size = env_int("RM_REPORT_PAGE_SIZE", DEFAULT_PAGE_SIZE, minimum=0)
+
+    pages_dir = _pages_dir(html_output_path)
+    _remove_stale_pages(pages_dir)
+    candidates = iter_candidates(json_input_path)
+
+    if not page_size:
+        # One unbounded page: count first (cheap, streamed) so the header is exact.
+        total = sum(1 for _ in iter_candidates(json_input_path))
+        with open(html_output_path, "w", encoding="utf-8") as f:
+            _write_page_start(f, "Resource Report", _plural(total))
+            if not total:
+                f.write(_EMPTY_HTML)
+            _write_cards(f, candidates)
+            _write_page_end(f)
+        return [html_output_path]
+
+    index_name = os.path.basename(html_output_path)
+    pages_rel = os.path.basename(pages_dir)
+    written: List[str] = []
+    entries: List[str] = []
+    pending: List[Dict[str, Any]] = []
+    start = 0
+
+    def write_page(page: List[Dict[str, Any]], has_next: bool) -> None:
+        n = len(written) + 1
+        page_name = f"page-{n:04d}.html"
+        nav = _pager(
+            f"page-{n - 1:04d}.html" if n > 1 else None,
+            f"../{index_name}",
+            f"page-{n + 1:04d}.html" if has_next else None,
+        )
+        os.makedirs(pages_dir, exist_ok=True)
+        path = os.path.join(pages_dir, page_name)
+        with open(path, "w", encoding="utf-8") as f:
+            _write_page_start(
+                f, f"Resource Report - page {n}", f"Candidates {start + 1}-{start + len(page)}"
+            )
+            f.write(nav)
+            _write_cards(f, page)
+            f.write(nav)
+            _write_page_end(f)
+        written.append(path)
+        entries.append(
+            f'      <li><a href="{pages_rel}/{page_name}">Page {n}: candidates {start + 1}-{start + len(page)}</a>'
+            f'<span class="range">{_html_escape(_candidate_name(page[0]))} &ndash; '
+            f"{_html_escape(_candidate_name(page[-1]))}</span></li>\n"
+        )
+
+    for candidate in candidates:
+        pending.append(candidate)
+        # Flush only once the next page is known to exist, so "Next" links are exact.
+        if len(pending) > page_size:
+            write_page(pending[:page_size], has_next=True)
+            start += page_size
+            pending = pending[page_size:]
+
+    if not written:
+        total = len(pending)
+        with open(html_output_path, "w", encoding="utf-8") as f:
+            _write_page_start(f, "Resource Report", _plural(total))
+            if not total:
+                f.write(_EMPTY_HTML)
+            _write_cards(f, pending)
+            _write_page_end(f)
+        return [html_output_path]
+
+    if pending:
+        write_page(pending, has_next=False)
+    total = start + len(pending)
+    with open(html_output_path, "w", encoding="utf-8") as f:
+        _write_page_start(f, "Resource Report", f"{_plural(total)} on {len(written)} pages")
+        f.write('    <ul class="pages">\n')
+        f.writelines(entries)
+        f.write("    </ul>\n")
+        _write_page_end(f)
+    return [html_output_path] + written
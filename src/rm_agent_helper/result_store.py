@@ -0,0 +1,316 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from rm_agent_helper.settings import env_flag, env_int, env_str
+from rm_agent_helper.skills import skill_key
+
+
+DEFAULT_STORE_PATH = os.path.join("output", "results.sqlite3")
+
+# One row set per run: candidates and matches are never updated in place, so every
+# earlier run stays queryable until it falls out of the retention window.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    candidates INTEGER NOT NULL,
+    jobs INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS candidates (
+    run_id INTEGER NOT NULL,
+    resource_file TEXT NOT NULL,
+    resource_name TEXT NOT NULL COLLATE NOCASE,
+    job_title TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (run_id, resource_file)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS candidates_title ON candidates (run_id, job_title);
+CREATE INDEX IF NOT EXISTS candidates_name ON candidates (run_id, resource_name);
+CREATE TABLE IF NOT EXISTS skills (
+    run_id INTEGER NOT NULL,
+    skill_key TEXT NOT NULL,
+    resource_file TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    PRIMARY KEY (run_id, skill_key, resource_file)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS skills_file ON skills (run_id, resource_file);
+CREATE TABLE IF NOT EXISTS jobs (
+    run_id INTEGER NOT NULL,
+    job_file TEXT NOT NULL,
+    job_title TEXT NOT NULL,
+    PRIMARY KEY (run_id, job_file)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS matches (
+    run_id INTEGER NOT NULL,
+    job_file TEXT NOT NULL,
+    resource_file TEXT NOT NULL,
+    resource_name TEXT NOT NULL,
+    percent INTEGER NOT NULL,
+    PRIMARY KEY (run_id, job_file, resource_file)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS matches_job_percent ON matches (run_id, job_file, percent DESC);
+CREATE INDEX IF NOT EXISTS matches_resource ON matches (run_id, resource_file, percent DESC);
+"""
+
+
+def _like_prefix(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def _percent(value: Any) -> int:
+    try:
+        return max(0, min(100, int(round(float(value)))))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _page(total: int, limit: int, offset: int, run_id: Optional[int], items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"run_id": run_id, "total": total, "limit": limit, "offset": offset, "items": items}
+
+
+class ResultStore:
+    """SQLite store of analysed candidates, their skills, jobs and match scores per run.
+
+    Each operation opens its own short-lived connection, like the LLM response cache,
+    so one store can be shared by the API's request threads and crew workers. Queries
+    default to the latest run that recorded the kind of row asked for.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, keep_runs: int = 20) -> None:
+        self.path = path
+        self.keep_runs = keep_runs
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record_run(self, candidates: Optional[List[Dict[str, Any]]], job_matches: Optional[List[Dict[str, Any]]]) -> int:
+        """Store one run's normalized candidates and job-match report; returns the run id.
+
+        Either may be None when the run produced no new data of that kind.
+        """
+        candidate_rows: List[Tuple[str, str, str]] = []
+        skill_rows: Dict[Tuple[str, str], str] = {}
+        for c in candidates or []:
+            if not isinstance(c, dict) or not c.get("resource-file"):
+                continue
+            resource_file = str(c["resource-file"])
+            candidate_rows.append((resource_file, str(c.get("resource-name") or ""), str(c.get("resource-job-title") or "")))
+            expertise = c.get("experties")
+            for skill in expertise if isinstance(expertise, list) else []:
+                key = skill_key(skill)
+                if key:
+                    skill_rows.setdefault((key, resource_file), str(skill).strip())
+
+        job_rows: Dict[str, str] = {}
+        match_rows: Dict[Tuple[str, str], Tuple[str, int]] = {}
+        for entry in job_matches or []:
+            if not isinstance(entry, dict) or not entry.get("job-file"):
+                continue
+            job_file = str(entry["job-file"])
+            job_rows.setdefault(job_file, str(entry.get("job-title") or ""))
+            for m in entry.get("matches") or []:
+                if isinstance(m, dict) and m.get("resource-file"):
+                    match_rows.setdefault(
+                        (job_file, str(m["resource-file"])), (str(m.get("resource-name") or ""), _percent(m.get("percent")))
+                    )
+
+        conn = self._connect()
+        try:
+            with conn:
+                run_id = conn.execute(
+                    "INSERT INTO runs (created_at, candidates, jobs) VALUES (?, ?, ?)",
+                    (time.time(), len(candidate_rows), len(job_rows)),
+                ).lastrowid
+                conn.executemany(
+                    "INSERT OR REPLACE INTO candidates (run_id, resource_file, resource_name, job_title) VALUES (?, ?, ?, ?)",
+                    ((run_id, *row) for row in sorted(candidate_rows)),
+                )
+                conn.executemany(
+                    "INSERT INTO skills (run_id, skill_key, resource_file, skill) VALUES (?, ?, ?, ?)",
+                    ((run_id, key, f, skill) for (key, f), skill in sorted(skill_rows.items())),
+                )
+                conn.executemany(
+                    "INSERT INTO jobs (run_id, job_file, job_title) VALUES (?, ?, ?)",
+                    ((run_id, f, title) for f, title in job_rows.items()),
+                )
+                conn.executemany(
+                    "INSERT INTO matches (run_id, job_file, resource_file, resource_name, percent) VALUES (?, ?, ?, ?, ?)",
+                    ((run_id, j, r, name, percent) for (j, r), (name, percent) in sorted(match_rows.items())),
+                )
+                self._prune(conn)
+            # Sampled statistics let the planner pick between the skill, title and name
+            # indexes instead of scanning a whole run in resource-file order.
+            conn.execute("PRAGMA analysis_limit=1000")
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+        return int(run_id)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        if self.keep_runs <= 0:
+            return
+        old = [row[0] for row in conn.execute("SELECT id FROM runs ORDER BY id DESC LIMIT -1 OFFSET ?", (self.keep_runs,))]
+        for table in ("candidates", "skills", "jobs", "matches"):
+            conn.executemany(f"DELETE FROM {table} WHERE run_id = ?", ((run_id,) for run_id in old))
+        conn.executemany("DELETE FROM runs WHERE id = ?", ((run_id,) for run_id in old))
+
+    def _run_for(self, conn: sqlite3.Connection, run_id: Optional[int], kind: str) -> Optional[int]:
+        if run_id is not None:
+            return run_id
+        row = conn.execute(f"SELECT MAX(id) FROM runs WHERE {kind} > 0").fetchone()
+        return row[0] if row else None
+
+    def runs(self, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        conn = self._connect()
+        try:
+            total = conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+            items = [
+                {"run_id": r[0], "created_at": r[1], "candidates": r[2], "jobs": r[3]}
+                for r in conn.execute(
+                    "SELECT id, created_at, candidates, jobs FROM runs ORDER BY id DESC LIMIT ? OFFSET ?", (limit, offset)
+                )
+            ]
+        finally:
+            conn.close()
+        return _page(total, limit, offset, None, items)
+
+    def candidates(
+        self,
+        skill: Optional[str] = None,
+        title: Optional[str] = None,
+        name: Optional[str] = None,
+        run_id: Optional[int] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """Candidates with ``skill`` (case-insensitive) whose title and name start with
+        ``title`` / ``name``, ordered by resource file."""
+        conn = self._connect()
+        try:
+            run_id = self._run_for(conn, run_id, "candidates")
+            where = ["c.run_id = ?"]
+            params: List[Any] = [run_id]
+            source = "candidates c"
+            order = "c.resource_file"
+            if skill:
+                # Drive from the skill's primary-key range (CROSS JOIN fixes the join order):
+                # it is usually the most selective filter and is already in file order.
+                order = "s.resource_file"
+                source = "skills s CROSS JOIN candidates c ON c.run_id = s.run_id AND c.resource_file = s.resource_file"
+                where.insert(0, "s.run_id = ? AND s.skill_key = ?")
+                params[:0] = [run_id, skill_key(skill)]
+            if title:
+                where.append("c.job_title LIKE ? ESCAPE '\\'")
+                params.append(_like_prefix(title))
+            if name:
+                where.append("c.resource_name LIKE ? ESCAPE '\\'")
+                params.append(_like_prefix(name))
+            clause = " AND ".join(where)
+            total = conn.execute(f"SELECT COUNT(*) FROM {source} WHERE {clause}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT c.resource_file, c.resource_name, c.job_title FROM {source} WHERE {clause} "
+                f"ORDER BY {order} LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+            skills = self._skills(conn, run_id, [r[0] for r in rows])
+        finally:
+            conn.close()
+        items = [
+            {"resource-file": f, "resource-name": n, "resource-job-title": t, "experties": skills.get(f, [])}
+            for f, n, t in rows
+        ]
+        return _page(total, limit, offset, run_id, items)
+
+    def _skills(self, conn: sqlite3.Connection, run_id: Optional[int], files: Iterable[str]) -> Dict[str, List[str]]:
+        files = list(files)
+        out: Dict[str, List[str]] = {}
+        if not files:
+            return out
+        marks = ",".join("?" * len(files))
+        for resource_file, skill in conn.execute(
+            # Without statistics the planner prefers a primary-key range scan of the whole run here.
+            f"SELECT resource_file, skill FROM skills INDEXED BY skills_file "
+            f"WHERE run_id = ? AND resource_file IN ({marks}) ORDER BY skill",
+            [run_id, *files],
+        ):
+            out.setdefault(resource_file, []).append(skill)
+        return out
+
+    def jobs(self, run_id: Optional[int] = None) -> Dict[str, Any]:
+        conn = self._connect()
+        try:
+            run_id = self._run_for(conn, run_id, "jobs")
+            items = [
+                {"job-file": f, "job-title": t}
+                for f, t in conn.execute("SELECT job_file, job_title FROM jobs WHERE run_id = ? ORDER BY job_file", (run_id,))
+            ]
+        finally:
+            conn.close()
+        return _page(len(items), len(items), 0, run_id, items)
+
+    def matches(
+        self,
+        job_file: Optional[str] = None,
+        resource_file: Optional[str] = None,
+        min_percent: int = 0,
+        run_id: Optional[int] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """Match scores of at least ``min_percent``, best first, optionally for one job or resume."""
+        conn = self._connect()
+        try:
+            run_id = self._run_for(conn, run_id, "jobs")
+            where = ["run_id = ?", "percent >= ?"]
+            params: List[Any] = [run_id, min_percent]
+            if job_file:
+                where.append("job_file = ?")
+                params.append(job_file)
+            if resource_file:
+                where.append("resource_file = ?")
+                params.append(resource_file)
+            clause = " AND ".join(where)
+            total = conn.execute(f"SELECT COUNT(*) FROM matches WHERE {clause}", params).fetchone()[0]
+            items = [
+                {"job-file": j, "resource-file": r, "resource-name": n, "percent": p}
+                for j, r, n, p in conn.execute(
+                    f"SELECT job_file, resource_file, resource_name, percent FROM matches WHERE {clause} "
+                    "ORDER BY percent DESC, job_file, resource_file LIMIT ? OFFSET ?",
+                    params + [limit, offset],
+                )
+            ]
+        finally:
+            conn.close()
+        return _page(total, limit, offset, run_id, items)
+
+
+_default_store: Optional[ResultStore] = None
+_default_lock = threading.Lock()
+
+
+def get_result_store() -> Optional[ResultStore]:
+    """Return the process-wide result store, or None when RM_RESULTS_STORE=0."""
+    global _default_store
+    if not env_flag("RM_RESULTS_STORE", True):
+        return None
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ResultStore(
+                env_str("RM_RESULTS_DB", DEFAULT_STORE_PATH),
+                keep_runs=env_int("RM_RESULTS_KEEP_RUNS", 20, minimum=0),
+            )
+    return _default_store
@@ -0,0 +1,456 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from rm_agent_helper.settings import env_str
+
+
+DEFAULT_INDEX_PATH = os.path.join("output", "skill_index.json")
+
+# Canonical skill -> variants the analyser writes for it. Matching ignores case,
+# spacing and "." "-" "_" "/" separators, and a trailing version number ("python3",
+# "Java 17") when the bare name is known. Extend with RM_SKILL_SYNONYMS.
+SKILL_SYNONYMS: Dict[str, List[str]] = {
+    "Python": ["py", "python3", "cpython"],
+    "JavaScript": ["js", "ecmascript", "es6", "vanilla js"],
+    "TypeScript": ["ts"],
+    "Node.js": ["node", "nodejs"],
+    "React": ["reactjs", "react.js"],
+    "Angular": ["angularjs", "angular.js"],
+    "Vue.js": ["vue", "vuejs"],
+    "Java": ["core java", "java se", "java ee"],
+    "Spring Boot": ["springboot"],
+    "C++": ["cpp"],
+    "C#": ["csharp", "c sharp"],
+    ".NET": ["dotnet", "net core", ".net core", "asp.net"],
+    "Go": ["golang"],
+    "SQL": ["structured query language"],
+    "PostgreSQL": ["postgres", "psql"],
+    "MySQL": [],
+    "MongoDB": ["mongo"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    "Kubernetes": ["k8s", "kube"],
+    "Docker": ["docker containers"],
+    "Terraform": [],
+    "AWS": ["amazon web services"],
+    "Azure": ["microsoft azure"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "CI/CD": ["continuous integration", "continuous delivery", "continuous deployment"],
+    "Git": ["github", "gitlab"],
+    "Linux": [],
+    "Machine Learning": ["ml"],
+    "Deep Learning": [],
+    "Artificial Intelligence": ["ai"],
+    "NLP": ["natural language processing"],
+    "Data Analysis": ["data analytics"],
+    "Power BI": ["powerbi", "microsoft power bi"],
+    "Tableau": [],
+    "Excel": ["microsoft excel", "ms excel", "advanced excel"],
+    "Agile": ["agile methodologies", "agile methodology", "agile development"],
+    "Scrum": [],
+    "Project Management": ["project manager", "pmp"],
+    "Test Automation": ["automation testing", "automated testing"],
+    "Selenium": ["selenium webdriver"],
+    "UI/UX Design": ["ui/ux", "ux/ui", "ui ux design", "ux design", "ui design"],
+    "Graphic Design": [],
+    "SEO": ["search engine optimization"],
+    "Social Media Marketing": ["smm", "social media"],
+    "Content Creation": ["content writing"],
+    "Accounting": ["financial accounting"],
+    "Bookkeeping": ["book keeping"],
+    "Payroll": ["payroll management"],
+    "Communication": ["communication skills", "communications"],
+}
+
+_SPACE_RE = re.compile(r"\s+")
+_SEPARATOR_RE = re.compile(r"[\s.\-_/]+")
+_VERSION_RE = re.compile(r"^(.*?[a-z+#])\s*v?\d+(?:\.\d+)*$")
+_TOKEN_RE = re.compile(r'\s*(\(|\)|"[^"]*"|[^\s()"]+)')
+_OPERATORS = ("AND", "OR", "NOT")
+
+
+def _normalize(skill: Any) -> str:
+    text = _SPACE_RE.sub(" ", str(skill or "").replace("&", " and ").lower()).strip()
+    return text.strip(" ,;:*-•·")
+
+
+def _squash(text: str) -> str:
+    return _SEPARATOR_RE.sub("", text)
+
+
+def _load_synonyms() -> Dict[str, List[str]]:
+    table = {k: list(v) for k, v in SKILL_SYNONYMS.items()}
+    path = env_str("RM_SKILL_SYNONYMS", "")
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                extra = json.load(f)
+            for canonical, variants in (extra.items() if isinstance(extra, dict) else []):
+                table.setdefault(str(canonical), []).extend(str(v) for v in variants or [])
+        except Exception as e:
+            print(f"Warning: failed to load skill synonyms from {path}: {e}")
+    return table
+
+
+class SkillVocabulary:
+    """Maps free-form skill strings to canonical skills using a synonym table."""
+
+    def __init__(self, synonyms: Optional[Dict[str, List[str]]] = None) -> None:
+        synonyms = _load_synonyms() if synonyms is None else synonyms
+        self._lookup: Dict[str, str] = {}
+        self._keys: Dict[str, str] = {}
+        self.display: Dict[str, str] = {}
+        for canonical, variants in synonyms.items():
+            key = _normalize(canonical)
+            self.display[key] = canonical
+            for variant in [canonical, *variants]:
+                normalized = _normalize(variant)
+                self._lookup.setdefault(normalized, key)
+                self._lookup.setdefault(_squash(normalized), key)
+        encoded = json.dumps(sorted((k, sorted(v)) for k, v in synonyms.items()), ensure_ascii=False)
+        self.version = hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+    def key(self, skill: Any) -> str:
+        """Canonical lookup key for ``skill`` ("" for blank input)."""
+        raw = str(skill or "")
+        key = self._keys.get(raw)
+        if key is None:
+            # Corpora repeat the same few thousand skill strings, so keys are memoised.
+            key = self._keys[raw] = self._resolve(raw)
+        return key
+
+    def _resolve(self, skill: str) -> str:
+        normalized = _normalize(skill)
+        if not normalized:
+            return ""
+        for candidate in (normalized, _squash(normalized)):
+            if candidate in self._lookup:
+                return self._lookup[candidate]
+        match = _VERSION_RE.match(normalized)
+        if match:
+            base = match.group(1).strip()
+            for candidate in (base, _squash(base)):
+                if candidate in self._lookup:
+                    return self._lookup[candidate]
+        return normalized
+
+    def canonical(self, skill: Any) -> str:
+        """Display form of ``skill``'s canonical skill ("Python" for "python3")."""
+        key = self.key(skill)
+        return self.display.get(key, str(skill or "").strip() if key else "")
+
+
+_vocabulary: Optional[SkillVocabulary] = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_vocabulary() -> SkillVocabulary:
+    global _vocabulary
+    with _vocabulary_lock:
+        if _vocabulary is None:
+            _vocabulary = SkillVocabulary()
+    return _vocabulary
+
+
+def skill_key(skill: Any) -> str:
+    return get_vocabulary().key(skill)
+
+
+def canonical_skill(skill: Any) -> str:
+    return get_vocabulary().canonical(skill)
+
+
+def _tokenize(expression: str) -> List[str]:
+    tokens: List[str] = []
+    pos = 0
+    expression = expression.strip()
+    while pos < len(expression):
+        match = _TOKEN_RE.match(expression, pos)
+        if not match:
+            break
+        tokens.append(match.group(1))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser for skill queries.
+
+    Grammar (operators are case-insensitive; NOT binds tightest, then AND, then OR):
+        expr := term (OR term)* ; term := NOT* factor (AND NOT* factor)* ;
+        factor := "(" expr ")" | skill
+    NOT is only handled in ``_term``, as a set difference against the other factors.
+    A skill is a quoted string or a run of bare words ("machine learning").
+    """
+
+    def __init__(self, tokens: List[str], index: "SkillIndex") -> None:
+        self.tokens = tokens
+        self.pos = 0
+        self.index = index
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _is_op(self, token: Optional[str], op: str) -> bool:
+        return token is not None and token.upper() == op
+
+    def parse(self) -> Set[str]:
+        result = self._expr()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected {self._peek()!r} in skill query")
+        return result
+
+    def _expr(self) -> Set[str]:
+        result = self._term()
+        while self._is_op(self._peek(), "OR"):
+            self.pos += 1
+            result = result | self._term()
+        return result
+
+    def _term(self) -> Set[str]:
+        # "a AND NOT b" is evaluated as a - b, so the complement of b is only built
+        # when a term has no positive factor at all ("NOT b", "(NOT b)", "a OR NOT b").
+        included: List[Set[str]] = []
+        excluded: List[Set[str]] = []
+        while True:
+            negated = False
+            while self._is_op(self._peek(), "NOT"):
+                self.pos += 1
+                negated = not negated
+            (excluded if negated else included).append(self._factor())
+            if not self._is_op(self._peek(), "AND"):
+                break
+            self.pos += 1
+        included.sort(key=len)
+        result = set(included[0]) if included else set(self.index.skills_by_file)
+        for files in included[1:]:
+            result &= files
+        for files in excluded:
+            result -= files
+        return result
+
+    def _factor(self) -> Set[str]:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Skill query ended unexpectedly")
+        if token == "(":
+            self.pos += 1
+            result = self._expr()
+            if self._peek() != ")":
+                raise ValueError("Missing ')' in skill query")
+            self.pos += 1
+            return result
+        if token == ")" or token.upper() in _OPERATORS:
+            raise ValueError(f"Expected a skill before {token!r}")
+        words: List[str] = []
+        while True:
+            token = self._peek()
+            if token is None or token in ("(", ")") or token.upper() in _OPERATORS:
+                break
+            words.append(token[1:-1] if token.startswith('"') else token)
+            self.pos += 1
+        return set(self.index.files_with(" ".join(words)))
+
+
+def _entry(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    expertise = candidate.get("experties")
+    return {
+        "resource-file": str(candidate.get("resource-file") or ""),
+        "resource-name": candidate.get("resource-name") or "",
+        "resource-job-title": candidate.get("resource-job-title") or "",
+        "experties": list(expertise) if isinstance(expertise, list) else [],
+    }
+
+
+class SkillIndex:
+    """Inverted index from canonical skill to the resource files of candidates that have it.
+
+    Candidates are keyed by resource-file. ``sync`` applies a new candidate list
+    incrementally: only added, changed and removed candidates touch the postings.
+    """
+
+    def __init__(self, vocabulary: Optional[SkillVocabulary] = None) -> None:
+        self.vocabulary = vocabulary or get_vocabulary()
+        self.postings: Dict[str, Set[str]] = {}
+        self.skills_by_file: Dict[str, Set[str]] = {}
+        self.candidates: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def update(self, candidate: Dict[str, Any]) -> None:
+        """Index (or re-index) one candidate."""
+        resource_file = str(candidate.get("resource-file") or "")
+        if not resource_file:
+            return
+        self.remove(resource_file)
+        entry = _entry(candidate)
+        keys = {k for k in map(self.vocabulary.key, entry["experties"]) if k}
+        self._add(entry, keys)
+
+    def _add(self, entry: Dict[str, Any], keys: Set[str]) -> None:
+        resource_file = entry["resource-file"]
+        for key in keys:
+            self.postings.setdefault(key, set()).add(resource_file)
+        self.skills_by_file[resource_file] = keys
+        self.candidates[resource_file] = entry
+
+    def remove(self, resource_file: str) -> None:
+        for key in self.skills_by_file.pop(resource_file, ()):
+            files = self.postings.get(key)
+            if files is not None:
+                files.discard(resource_file)
+                if not files:
+                    del self.postings[key]
+        self.candidates.pop(resource_file, None)
+
+    def sync(self, candidates: Iterable[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """Make the index match ``candidates``; returns (added, updated, removed)."""
+        incoming: Dict[str, Dict[str, Any]] = {}
+        for c in candidates:
+            if isinstance(c, dict) and c.get("resource-file"):
+                incoming[str(c["resource-file"])] = c
+        removed = [f for f in self.candidates if f not in incoming]
+        for resource_file in removed:
+            self.remove(resource_file)
+        added = updated = 0
+        for resource_file, candidate in incoming.items():
+            previous = self.candidates.get(resource_file)
+            if previous == _entry(candidate):
+                continue
+            if previous is None:
+                added += 1
+            else:
+                updated += 1
+            self.update(candidate)
+        return added, updated, len(removed)
+
+    def files_with(self, skill: str) -> Set[str]:
+        return self.postings.get(self.vocabulary.key(skill), set())
+
+    def query(self, expression: str) -> List[str]:
+        """Resource files matching a boolean skill query, sorted.
+
+        Example: ``python AND (kubernetes OR docker) AND NOT "project management"``.
+        Raises ValueError for a malformed query.
+        """
+        tokens = _tokenize(expression or "")
+        if not tokens:
+            raise ValueError("Empty skill query")
+        return sorted(_Parser(tokens, self).parse())
+
+    def search(
+        self,
+        all_of: Iterable[str] = (),
+        any_of: Iterable[str] = (),
+        none_of: Iterable[str] = (),
+    ) -> List[str]:
+        """Resource files having every skill in ``all_of``, at least one in ``any_of``
+        (when given) and none in ``none_of``, sorted."""
+        all_of, any_of = list(all_of), list(any_of)
+        result: Set[str] = set(self.skills_by_file)
+        for skill in sorted(all_of, key=lambda s: len(self.files_with(s))):
+            result &= self.files_with(skill)
+        if any_of:
+            result &= set().union(*(self.files_with(s) for s in any_of))
+        for skill in none_of:
+            result -= self.files_with(skill)
+        return sorted(result)
+
+    def skill_counts(self) -> List[Tuple[str, int]]:
+        """(canonical skill, candidate count) pairs, most common first."""
+        counts = [(self.vocabulary.display.get(k, k), len(files)) for k, files in self.postings.items()]
+        return sorted(counts, key=lambda item: (-item[1], item[0].lower()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "vocabulary": self.vocabulary.version,
+            "candidates": [
+                {**c, "skills": sorted(self.skills_by_file.get(f, ()))}
+                for f, c in self.candidates.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], vocabulary: Optional[SkillVocabulary] = None) -> "SkillIndex":
+        index = cls(vocabulary)
+        # Stored canonical keys are only reused with the synonym table they came from.
+        reuse = data.get("vocabulary") == index.vocabulary.version
+        for entry in data.get("candidates") or []:
+            if not isinstance(entry, dict) or not entry.get("resource-file"):
+                continue
+            if reuse:
+                index._add(_entry(entry), set(entry.get("skills") or []))
+            else:
+                index.update(entry)
+        return index
+
+
+def skill_index_path() -> str:
+    return env_str("RM_SKILL_INDEX", DEFAULT_INDEX_PATH)
+
+
+def load_skill_index(path: Optional[str] = None) -> SkillIndex:
+    """Load the persisted index, or an empty one if there is none yet.
+
+    A truncated or malformed file is also treated as empty, so the next sync rewrites it.
+    """
+    path = path or skill_index_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return SkillIndex.from_dict(json.load(f))
+    except FileNotFoundError:
+        return SkillIndex()
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        print(f"Warning: ignoring unreadable skill index {path}: {e}")
+        return SkillIndex()
+
+
+def save_skill_index(index: SkillIndex, path: Optional[str] = None) -> None:
+    path = path or skill_index_path()
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    # A unique temp file per writer, so concurrent saves never share a partial file.
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def update_skill_index(candidates: List[Dict[str, Any]], path: Optional[str] = None) -> Tuple[int, int, int]:
+    """Sync the persisted index with a run's candidates; returns (added, updated, removed)."""
+    index = load_skill_index(path)
+    changes = index.sync(candidates)
+    if any(changes) or not os.path.exists(path or skill_index_path()):
+        save_skill_index(index, path)
+    return changes
+
+
+_cached: Optional[Tuple[str, float, SkillIndex]] = None
+_cached_lock = threading.Lock()
+
+
+def get_skill_index() -> SkillIndex:
+    """Process-wide index for queries, reloaded when the persisted file changes."""
+    global _cached
+    path = skill_index_path()
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = 0.0
+    with _cached_lock:
+        if _cached is None or _cached[0] != path or _cached[1] != mtime:
+            _cached = (path, mtime, load_skill_index(path))
+        return _cached[2]
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from rm_agent_helper.settings import env_flag, env_float, env_str
+from rm_agent_helper.tools.extractors import IncompleteText, extract_text, extractor_signature
+
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "extraction")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ExtractionCache:
+    """On-disk cache of extracted resume text keyed by file content and extractor version
+    (including the PDF page/character limits).
+
+    Entries are plain UTF-8 files under ``cache_dir`` so they are shared between
+    tool instances, runs, API kickoffs and processes. Writes are atomic; when the
+    cache grows past ``max_bytes`` the least recently used entries are removed.
+    Empty results are never cached.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    def _key(self, digest: str) -> str:
+        return f"{digest}-v{extractor_signature()}"
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".txt")
+
+    def get(self, digest: str) -> Optional[str]:
+        entry = self._entry_path(self._key(digest))
+        try:
+            with open(entry, "r", encoding="utf-8") as f:
+                text = f.read()
+        except Exception:
+            return None
+        if not text:
+            # Entries written before empty results were skipped; extract those again.
+            return None
+        try:
+            # Refresh the access time used for LRU eviction.
+            os.utime(entry, None)
+        except Exception:
+            pass
+        return text
+
+    def put(self, digest: str, text: str) -> None:
+        if not text:
+            # An empty result usually means the extractor failed (it swallows errors),
+            # so it is not cached and the file is extracted again next time.
+            return
+        entry = self._entry_path(self._key(digest))
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(entry), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, entry)
+        except Exception:
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size += len(text.encode("utf-8"))
+        self._maybe_evict()
+
+    def lookup(self, path: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return ``(digest, cached_text)`` for a file; either may be None."""
+        try:
+            digest = file_digest(path)
+        except Exception:
+            return None, None
+
+        cached = self.get(digest)
+        if cached is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return digest, cached
+
+    def get_or_extract(self, path: str, extractor: Callable[[str], str] = extract_text) -> str:
+        digest, cached = self.lookup(path)
+        if cached is not None:
+            return cached
+
+        text = extractor(path)
+        if digest is not None and not isinstance(text, IncompleteText):
+            self.put(digest, text)
+        return text
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries: List[Tuple[float, int, str]] = []
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".txt"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except Exception:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _maybe_evict(self) -> None:
+        with self._lock:
+            if self._size is not None and self._size <= self.max_bytes:
+                return
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total > self.max_bytes:
+                # Drop down to 90% of the budget so we don't evict on every put.
+                target = int(self.max_bytes * 0.9)
+                for _, size, path in sorted(entries):
+                    if total <= target:
+                        break
+                    try:
+                        os.remove(path)
+                        total -= size
+                    except Exception:
+                        continue
+            self._size = total
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except Exception:
+                    continue
+            self._size = 0
+
+
+_default_cache: Optional[ExtractionCache] = None
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Return the process-wide cache, or None when disabled via RM_EXTRACTION_CACHE=0."""
+    global _default_cache
+    if not env_flag("RM_EXTRACTION_CACHE", True):
+        return None
+    if _default_cache is None:
+        cache_dir = env_str("RM_EXTRACTION_CACHE_DIR", DEFAULT_CACHE_DIR)
+        max_bytes = int(env_float("RM_EXTRACTION_CACHE_MAX_MB", 512) * 1024 * 1024)
+        _default_cache = ExtractionCache(cache_dir, max_bytes)
+    return _default_cache
+
+
+def cached_extract_text(path: str) -> str:
+    cache = get_extraction_cache()
+    if cache is None:
+        return extract_text(path)
+    return cache.get_or_extract(path)
@@ -0,0 +1,168 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from rm_agent_helper.metrics import EXTRACTION_CACHE, observe_extraction
+from rm_agent_helper.settings import env_float, env_int, env_str
+from rm_agent_helper.tools.extraction_cache import get_extraction_cache
+from rm_agent_helper.tools.extractors import IncompleteText, extract_text
+
+
+DEFAULT_TIMEOUT_SECONDS = 60.0
+_POLL_SECONDS = 0.05
+
+
+def extraction_workers() -> int:
+    """Worker count from RM_EXTRACTION_WORKERS ("auto" = one per CPU, default 1 = in-process)."""
+    if env_str("RM_EXTRACTION_WORKERS", "1").lower() == "auto":
+        return os.cpu_count() or 1
+    return env_int("RM_EXTRACTION_WORKERS", 1, minimum=1)
+
+
+def extraction_timeout() -> Optional[float]:
+    """Per-file timeout from RM_EXTRACTION_TIMEOUT in seconds (0 disables it)."""
+    value = env_float("RM_EXTRACTION_TIMEOUT", DEFAULT_TIMEOUT_SECONDS)
+    return value if value > 0 else None
+
+
+def _timed_extract(extractor: Callable[[str], str], path: str) -> Tuple[str, float]:
+    # Runs inside the worker; the duration is sent back so the parent can record it.
+    start = time.perf_counter()
+    text = extractor(path)
+    return text, time.perf_counter() - start
+
+
+def _stripped(text: Optional[str]) -> str:
+    stripped = (text or "").strip()
+    return IncompleteText(stripped) if isinstance(text, IncompleteText) else stripped
+
+
+def _terminate(executor: ProcessPoolExecutor) -> None:
+    # A stuck extractor cannot be cancelled once running, so the only way to
+    # reclaim its worker is to kill the pool's processes. ``_processes`` is a private
+    # ProcessPoolExecutor attribute with no public equivalent; if it is missing the
+    # stuck worker is left to finish on its own after shutdown.
+    processes = getattr(executor, "_processes", None)
+    for process in list(processes.values() if isinstance(processes, dict) else []):
+        try:
+            process.terminate()
+        except Exception:
+            pass
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_parallel(
+    paths: Sequence[str],
+    workers: int,
+    timeout: Optional[float],
+    extractor: Callable[[str], str],
+) -> List[Optional[str]]:
+    """Extract ``paths`` in a process pool; timed-out files come back as None.
+
+    At most ``workers`` files are in flight at once, so a submitted file is picked
+    up by an idle worker straight away and its timeout is measured from
+    submission. (ProcessPoolExecutor reports queued calls as running before any
+    worker takes them, so ``Future.running()`` cannot be used as the start.) When
+    a file exceeds ``timeout`` the pool is torn down and the files that had not
+    finished are resubmitted to a fresh pool, so one pathological document cannot
+    stall the rest of the batch.
+    """
+    results: List[Optional[str]] = [None] * len(paths)
+    remaining = list(range(len(paths)))
+
+    while remaining:
+        pool_size = min(workers, len(remaining))
+        executor = ProcessPoolExecutor(max_workers=pool_size)
+        queue = deque(remaining)
+        futures: Dict[Future, int] = {}
+        started: Dict[Future, float] = {}
+        pending: set[Future] = set()
+        finished: set[int] = set()
+        expired: List[int] = []
+
+        while queue or pending:
+            while queue and len(pending) < pool_size:
+                index = queue.popleft()
+                future = executor.submit(_timed_extract, extractor, paths[index])
+                futures[future] = index
+                started[future] = time.monotonic()
+                pending.add(future)
+
+            done, pending = wait(pending, timeout=_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                try:
+                    text, seconds = future.result()
+                    results[index] = _stripped(text)
+                    observe_extraction(paths[index], seconds)
+                except Exception:
+                    results[index] = ""
+                finished.add(index)
+
+            if timeout is None:
+                continue
+            now = time.monotonic()
+            expired = [futures[f] for f in pending if now - started[f] > timeout]
+            if expired:
+                break
+
+        if not expired:
+            executor.shutdown(wait=True)
+            break
+
+        _terminate(executor)
+        for index in expired:
+            print(f"Warning: extraction timed out after {timeout}s: {paths[index]}")
+        remaining = [i for i in remaining if i not in finished and i not in expired]
+
+    return results
+
+
+def extract_texts(
+    paths: Sequence[str],
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    extractor: Callable[[str], str] = extract_text,
+) -> List[str]:
+    """Extract text for each path, returned in the same order as ``paths``.
+
+    Cached files are served from the extraction cache in the calling process;
+    only cache misses are sent to the worker pool. With a single worker the
+    files are extracted in-process, sequentially and without timeouts.
+    """
+    workers = extraction_workers() if workers is None else max(1, workers)
+    if timeout is None:
+        timeout = extraction_timeout()
+
+    cache = get_extraction_cache()
+    texts: List[Optional[str]] = [None] * len(paths)
+    digests: List[Optional[str]] = [None] * len(paths)
+    if cache is not None:
+        for i, path in enumerate(paths):
+            digests[i], texts[i] = cache.lookup(path)
+            EXTRACTION_CACHE.labels("miss" if texts[i] is None else "hit").inc()
+
+    missing = [i for i, text in enumerate(texts) if text is None]
+    if workers <= 1 or not missing:
+        extracted: List[Optional[str]] = []
+        for i in missing:
+            text, seconds = _timed_extract(extractor, paths[i])
+            observe_extraction(paths[i], seconds)
+            extracted.append(_stripped(text))
+    else:
+        extracted = _extract_parallel([paths[i] for i in missing], workers, timeout, extractor)
+
+    for i, text in zip(missing, extracted):
+        if text is None:
+            # Timed out: leave it uncached so a later run can try again.
+            texts[i] = ""
+            continue
+        texts[i] = text
+        digest = digests[i]
+        # Text cut short by a time limit depends on load; extract it again next time.
+        if cache is not None and digest is not None and not isinstance(text, IncompleteText):
+            cache.put(digest, text)
+
+    return [text or "" for text in texts]
@@ -0,0 +1,333 @@
+import multiprocessing
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, List, NamedTuple, Optional
+from xml.etree import ElementTree
+
+from rm_agent_helper.metrics import timed
+from rm_agent_helper.settings import env_float, env_int
+
+
+# Bump whenever the text produced by the extractors below changes, so cached
+# extractions made by an older version are not reused.
+EXTRACTOR_VERSION = "3"
+
+RESUME_EXTENSIONS = (".txt", ".md", ".pdf", ".docx")
+
+
+class IncompleteText(str):
+    """Text from an extraction that was cut short by a time limit.
+
+    It is usable as-is, but depends on machine load, so callers must not cache it.
+    """
+
+
+class PdfLimits(NamedTuple):
+    max_pages: int
+    max_chars: int
+    timeout: Optional[float]
+    page_workers: int
+    parallel_min_pages: int
+
+
+def pdf_limits() -> PdfLimits:
+    """PDF extraction budget from the environment (0 disables a limit):
+
+    RM_PDF_MAX_PAGES (default 30), RM_PDF_MAX_CHARS (default 100000), RM_PDF_TIMEOUT
+    seconds per document (default 30), RM_PDF_PAGE_WORKERS processes for page-level
+    parallelism (default 1, off) used for documents of at least
+    RM_PDF_PARALLEL_MIN_PAGES pages (default 16).
+    """
+    timeout = env_float("RM_PDF_TIMEOUT", 30.0)
+    return PdfLimits(
+        max_pages=env_int("RM_PDF_MAX_PAGES", 30, minimum=0),
+        max_chars=env_int("RM_PDF_MAX_CHARS", 100000, minimum=0),
+        timeout=timeout if timeout > 0 else None,
+        page_workers=env_int("RM_PDF_PAGE_WORKERS", 1, minimum=1),
+        parallel_min_pages=env_int("RM_PDF_PARALLEL_MIN_PAGES", 16, minimum=1),
+    )
+
+
+def extractor_signature() -> str:
+    """EXTRACTOR_VERSION plus the settings that change extracted text, for cache keys."""
+    limits = pdf_limits()
+    return f"{EXTRACTOR_VERSION}-pdf{limits.max_pages}x{limits.max_chars}"
+
+
+def _page_text(page: Any) -> str:
+    try:
+        return page.extract_text() or ""
+    except Exception:
+        return ""
+
+
+_worker_reader: Any = None
+
+
+def _open_worker_reader(pdf_path: str) -> None:
+    # Pool initializer: each worker parses the file once, since pypdf objects cannot
+    # be shared between processes.
+    global _worker_reader
+    from pypdf import PdfReader
+
+    _worker_reader = PdfReader(pdf_path)
+
+
+def _extract_pdf_pages(start: int, stop: int) -> List[str]:
+    return [_page_text(_worker_reader.pages[i]) for i in range(start, stop)]
+
+
+def _extract_pdf_parallel(pdf_path: str, page_count: int, limits: PdfLimits, deadline: Optional[float]) -> str:
+    """Extract pages in chunks across worker processes, consuming them in page order so
+    the character budget and deadline can stop the document early."""
+    chunk = max(1, min(8, page_count // (limits.page_workers * 2) or 1))
+    executor = ProcessPoolExecutor(
+        max_workers=limits.page_workers, initializer=_open_worker_reader, initargs=(pdf_path,)
+    )
+    futures = [
+        executor.submit(_extract_pdf_pages, start, min(page_count, start + chunk))
+        for start in range(0, page_count, chunk)
+    ]
+    parts: List[str] = []
+    chars = 0
+    timed_out = False
+    try:
+        for future in futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                pages = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                timed_out = True
+                break
+            except Exception:
+                pages = []
+            for text in pages:
+                if text:
+                    parts.append(text)
+                    chars += len(text) + 1
+            if limits.max_chars and chars >= limits.max_chars:
+                break
+    finally:
+        stopped_early = not all(future.done() for future in futures)
+        if stopped_early:
+            # Running chunks cannot be cancelled and their pages are no longer needed
+            # (budget reached or deadline passed), so reclaim the workers.
+            for process in list((getattr(executor, "_processes", None) or {}).values()):
+                try:
+                    process.terminate()
+                except Exception:
+                    pass
+        executor.shutdown(wait=not stopped_early, cancel_futures=True)
+
+    text = "\n".join(parts)
+    if limits.max_chars:
+        text = text[: limits.max_chars]
+    return IncompleteText(text) if timed_out else text
+
+
+def _extract_text_from_pdf(pdf_path: str, limits: Optional[PdfLimits] = None) -> str:
+    """Extract up to ``max_pages`` pages / ``max_chars`` characters of a PDF.
+
+    Extraction stops as soon as the character budget is reached. Past the per-document
+    deadline the text gathered so far is returned as IncompleteText; the deadline is
+    checked between pages, so a single pathological page is only bounded by the
+    extraction pool's hard timeout. Large documents are split across processes when
+    RM_PDF_PAGE_WORKERS > 1 (only from the main process, never inside a pool worker).
+    """
+    try:
+        from pypdf import PdfReader
+    except Exception:
+        return ""
+
+    limits = limits or pdf_limits()
+    deadline = time.monotonic() + limits.timeout if limits.timeout else None
+    try:
+        reader = PdfReader(pdf_path)
+        page_count = len(reader.pages)
+        if limits.max_pages:
+            page_count = min(page_count, limits.max_pages)
+
+        if (
+            limits.page_workers > 1
+            and page_count >= limits.parallel_min_pages
+            and multiprocessing.parent_process() is None
+        ):
+            return _extract_pdf_parallel(pdf_path, page_count, limits, deadline)
+
+        text_parts: List[str] = []
+        chars = 0
+        for i in range(page_count):
+            if deadline is not None and time.monotonic() > deadline:
+                return IncompleteText("\n".join(text_parts))
+            page_text = _page_text(reader.pages[i])
+            if page_text:
+                text_parts.append(page_text)
+                chars += len(page_text) + 1
+            if limits.max_chars and chars >= limits.max_chars:
+                break
+        text = "\n".join(text_parts)
+        return text[: limits.max_chars] if limits.max_chars else text
+    except Exception:
+        return ""
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _extract_text_from_docx_xml(docx_path: str) -> str:
+    """Stream the text of ``word/document.xml`` straight out of the zip.
+
+    One pass with an incremental parser, in document order: body paragraphs, table
+    cells and text boxes each become a line. Elements are discarded as soon as they
+    are read, so memory does not grow with the document. Tags are matched by local
+    name so both transitional and strict OOXML namespaces work; the VML fallback copy
+    of a text box (mc:Fallback) is skipped so its text is not duplicated.
+    """
+    lines: List[str] = []
+    paragraphs: List[List[str]] = []
+    # Local names of the open elements; a w:tab is only text when its parent is a run
+    # (w:pPr/w:tabs/w:tab are tab-stop definitions, also inside text boxes within runs).
+    open_tags: List[str] = []
+    in_run = 0
+    in_fallback = 0
+    with zipfile.ZipFile(docx_path) as zf:
+        with zf.open("word/document.xml") as xml:
+            for event, elem in ElementTree.iterparse(xml, events=("start", "end")):
+                name = _local_name(elem.tag)
+                if event == "start":
+                    open_tags.append(name)
+                    if name == "p":
+                        paragraphs.append([])
+                    elif name == "r":
+                        in_run += 1
+                    elif name == "Fallback":
+                        in_fallback += 1
+                    continue
+
+                open_tags.pop()
+                if name == "t" and in_run and not in_fallback and paragraphs:
+                    if elem.text:
+                        paragraphs[-1].append(elem.text)
+                elif name == "tab" and open_tags and open_tags[-1] == "r" and not in_fallback and paragraphs:
+                    paragraphs[-1].append("\t")
+                elif name in ("br", "cr") and in_run and not in_fallback and paragraphs:
+                    paragraphs[-1].append("\n")
+                elif name == "r":
+                    in_run -= 1
+                    elem.clear()
+                elif name == "Fallback":
+                    in_fallback -= 1
+                    elem.clear()
+                elif name == "p" and paragraphs:
+                    text = "".join(paragraphs.pop()).strip()
+                    if text:
+                        lines.append(text)
+                    elem.clear()
+                elif name in ("tbl", "sdt", "body"):
+                    elem.clear()
+    return "\n".join(lines)
+
+
+def _extract_text_from_docx(docx_path: str) -> str:
+    # 1) Native streaming extractor (no third-party parser)
+    try:
+        content = _extract_text_from_docx_xml(docx_path).strip()
+        if content:
+            return content
+    except Exception:
+        pass
+
+    # 2) Fall back to python-docx
+    try:
+        import docx  # python-docx
+        try:
+            document = docx.Document(docx_path)
+            parts: List[str] = []
+            for p in document.paragraphs:
+                text = (p.text or "").strip()
+                if text:
+                    parts.append(text)
+            for table in getattr(document, "tables", []) or []:
+                for row in table.rows:
+                    for cell in row.cells:
+                        cell_text = (cell.text or "").strip()
+                        if cell_text:
+                            parts.append(cell_text)
+            content = "\n".join(parts).strip()
+            if content:
+                return content
+        except Exception:
+            pass
+    except Exception:
+        pass
+
+    # 3) Fallback to docx2txt
+    try:
+        import docx2txt
+        try:
+            content = (docx2txt.process(docx_path) or "").strip()
+            if content:
+                return content
+        except Exception:
+            pass
+    except Exception:
+        pass
+
+    # 4) Fallback to mammoth (HTML → text)
+    try:
+        import mammoth
+        try:
+            with open(docx_path, "rb") as f:
+                result = mammoth.convert_to_html(f)
+                html = (result.value or "").strip()
+                if html:
+                    # Strip tags very simply
+                    text = re.sub(r"<[^>]+>", "\n", html)
+                    text = re.sub(r"\n+", "\n", text)
+                    text = text.strip()
+                    if text:
+                        return text
+        except Exception:
+            pass
+    except Exception:
+        pass
+
+    return ""
+
+
+def is_resume_file(file_name: str) -> bool:
+    return file_name.lower().endswith(RESUME_EXTENSIONS)
+
+
+def extract_text(path: str) -> str:
+    """Extract plain text from a resume file, dispatching on its extension."""
+    try:
+        lower_name = path.lower()
+        if lower_name.endswith(".pdf"):
+            content = _extract_text_from_pdf(path)
+        elif lower_name.endswith(".docx"):
+            content = _extract_text_from_docx(path)
+        else:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                content = f.read()
+    except Exception:
+        content = ""
+    text = (content or "").strip()
+    return IncompleteText(text) if isinstance(content, IncompleteText) else text
+
+
+@timed("scan_resumes")
+def list_resume_files(resource_resume_dir: str) -> List[str]:
+    if not os.path.isdir(resource_resume_dir):
+        return []
+    resource_files: List[str] = []
+    for f in os.listdir(resource_resume_dir):
+        path = os.path.join(resource_resume_dir, f)
+        if os.path.isfile(path) and is_resume_file(f):
+            resource_files.append(f)
+    return sorted(resource_files)
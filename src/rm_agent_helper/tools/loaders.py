@@ -0,0 +1,89 @@
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from rm_agent_helper.metrics import stage_timer
+from rm_agent_helper.tools.extraction_pool import extract_texts
+from rm_agent_helper.tools.extractors import list_resume_files
+
+
+RESOURCE_RESUME_DIR = os.path.join("knowledge", "resource-resume")
+JOB_PROFILE_DIR = os.path.join("knowledge", "job-profile")
+
+# Full resume load shared by concurrent stages of one run; see shared_resumes(). A
+# context variable, so runs executing at the same time in the API never see each
+# other's corpus.
+_shared_resumes: ContextVar[Optional[List[dict]]] = ContextVar("rm_shared_resumes", default=None)
+
+
+@contextmanager
+def shared_resumes() -> Iterator[List[dict]]:
+    """Load every resume once and serve that list to all full loads inside the block.
+
+    Lets stages that run at the same time (analysis and matching, and the tools their
+    agents call) share one extraction instead of each extracting the folder. Only code
+    running in this context sees it; threads started inside the block must be given a
+    copy of the context (``contextvars.copy_context().run``).
+    """
+    resumes = load_resource_resumes()
+    token = _shared_resumes.set(resumes)
+    try:
+        yield resumes
+    finally:
+        _shared_resumes.reset(token)
+
+
+def load_resource_resumes(resource_files: Optional[List[str]] = None) -> List[dict]:
+    """Load resumes under knowledge/resource-resume as {resource-file, text} dicts.
+
+    Loads every resume unless ``resource_files`` names a subset.
+    """
+    if resource_files is None:
+        shared = _shared_resumes.get()
+        if shared is not None:
+            return shared
+        resource_files = list_resume_files(RESOURCE_RESUME_DIR)
+    resource_paths = [os.path.join(RESOURCE_RESUME_DIR, f) for f in resource_files]
+    # Unchanged files are served from the on-disk extraction cache; the rest
+    # are extracted in a process pool when RM_EXTRACTION_WORKERS > 1.
+    resource_texts = extract_texts(resource_paths)
+
+    loaded_resumes: List[dict] = []
+
+    for resource_file, resource_content in zip(resource_files, resource_texts):
+        loaded_resumes.append({
+            "resource-file": resource_file,
+            "text": resource_content,
+        })
+
+    return loaded_resumes
+
+
+def load_job_profiles() -> List[dict]:
+    """Load every job profile under knowledge/job-profile as {job-file, text} dicts."""
+    if not os.path.isdir(JOB_PROFILE_DIR):
+        return []
+
+    job_files: List[str] = []
+    with stage_timer("scan_jobs"):
+        for f in os.listdir(JOB_PROFILE_DIR):
+            path = os.path.join(JOB_PROFILE_DIR, f)
+            if not os.path.isfile(path):
+                continue
+            lower = f.lower()
+            if lower.endswith(".txt") or lower.endswith(".md"):
+                job_files.append(f)
+
+    loaded_jobs: List[dict] = []
+    for job_file in sorted(job_files):
+        job_path = os.path.join(JOB_PROFILE_DIR, job_file)
+        content = ""
+        try:
+            with open(job_path, "r", encoding="utf-8", errors="ignore") as f:
+                content = f.read()
+        except Exception:
+            content = ""
+        loaded_jobs.append({"job-file": job_file, "text": (content or "").strip()})
+
+    return loaded_jobs
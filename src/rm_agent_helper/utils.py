@@ -1,64 +1,149 @@
 import json
-import re
-from typing import Any
+from typing import Any, Iterator, List, Optional, Tuple
 
+from rm_agent_helper.metrics import timed
 
-_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```", re.IGNORECASE)
 
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
 
-def _try_parse_and_dump(text: str) -> str | None:
+
+def _decode_at(text: str, pos: int) -> Tuple[Any, int]:
+    """Decode one JSON value starting at ``pos``; returns (value, end) or (None, error position)."""
     try:
-        obj = json.loads(text)
-        return json.dumps(obj)
-    except Exception:
-        return None
+        value, end = _JSON_DECODER.raw_decode(text, pos)
+        return value, end
+    except json.JSONDecodeError as e:
+        return None, -max(e.pos, pos + 1)
+
+
+def _scan_for(text: str, opener: str) -> Any:
+    """First value starting with ``opener`` that decodes, scanning left to right.
+
+    When a candidate fails, scanning resumes at the position where decoding failed:
+    brackets nested inside a broken value (say, the skills list of a truncated
+    candidate) are never mistaken for the result, and each character is visited once.
+    """
+    pos = text.find(opener)
+    while pos != -1:
+        value, end = _decode_at(text, pos)
+        if end >= 0:
+            return value
+        pos = text.find(opener, -end)
+    return None
+
+
+def parse_json_output(raw_text: Any, openers: Tuple[str, ...] = ("[", "{")) -> Any:
+    """Parse the JSON payload of an LLM answer into Python objects.
+
+    Looks, in order, at a fenced ```json block, the whole text, then the first
+    decodable value for each of ``openers`` (an array, then an object, by default;
+    tasks that answer with one object pass ``("{", "[")`` so a list nested inside it is
+    not mistaken for the result). Incremental decoding means nothing is sliced, copied
+    or re-serialised. Returns [] when no JSON is found.
+    """
+    if not isinstance(raw_text, str):
+        return []
+    text = raw_text.strip()
+
+    # 1) Fenced block
+    fence = text.find("```")
+    if fence != -1:
+        pos = fence + 3
+        if text.startswith("json", pos) or text.startswith("JSON", pos):
+            pos += 4
+        while pos < len(text) and text[pos] in _WHITESPACE:
+            pos += 1
+        close = text.find("```", pos)
+        value, end = _decode_at(text, pos)
+        if end >= 0 and (close == -1 or end <= close):
+            return value
+
+    # 2) The whole text is JSON
+    if text[:1] in ("[", "{"):
+        value, end = _decode_at(text, 0)
+        if end == len(text):
+            return value
+    elif text:
+        try:
+            return json.loads(text)
+        except Exception:
+            pass
+
+    # 3) First decodable value per opener, embedded in prose
+    for opener in openers:
+        value = _scan_for(text, opener)
+        if value is not None:
+            return value
+    return []
 
 
 def extract_json_text(raw_text: str) -> str:
-    if not isinstance(raw_text, str):
-        return "[]"
+    return json.dumps(parse_json_output(raw_text))
 
-    candidate = raw_text.strip()
-
-    # 1) If entire content is fenced JSON or contains a fenced block, use it
-    m = _FENCE_RE.search(candidate)
-    if m:
-        fenced = m.group(1).strip()
-        dumped = _try_parse_and_dump(fenced)
-        if dumped is not None:
-            return dumped
-
-    # 2) Try direct parse
-    dumped = _try_parse_and_dump(candidate)
-    if dumped is not None:
-        return dumped
-
-    # 3) Heuristic: locate first/last JSON array or object
-    first_bracket = candidate.find("[")
-    last_bracket = candidate.rfind("]")
-    if first_bracket != -1 and last_bracket != -1 and last_bracket > first_bracket:
-        sliced = candidate[first_bracket : last_bracket + 1]
-        dumped = _try_parse_and_dump(sliced)
-        if dumped is not None:
-            return dumped
-
-    first_brace = candidate.find("{")
-    last_brace = candidate.rfind("}")
-    if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
-        sliced = candidate[first_brace : last_brace + 1]
-        dumped = _try_parse_and_dump(sliced)
-        if dumped is not None:
-            return dumped
-
-    return "[]"
 
+def iter_json_array(path: str, chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """Yield the items of the JSON array stored at ``path`` one at a time.
 
-def coerce_result_to_json_text(result_obj: Any) -> str:
+    The file is read in chunks, so memory is bounded by the largest item rather than
+    the whole document. Yields nothing if the file is missing or is not an array, and
+    stops at the first malformed item.
+    """
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except Exception:
+        return
+    with f:
+        buf = f.read(chunk_size)
+        eof = not buf
+        pos = len(buf) - len(buf.lstrip(_WHITESPACE))
+        if pos >= len(buf) or buf[pos] != "[":
+            return
+        pos += 1
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE + ",":
+                pos += 1
+            if pos >= len(buf):
+                if eof:
+                    return
+                buf, pos = f.read(chunk_size), 0
+                eof = not buf
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, end = _JSON_DECODER.raw_decode(buf, pos)
+            except ValueError:
+                item, end = None, -1
+            # An item only counts once it is followed by "," or "]": one cut off by the
+            # chunk boundary may still decode as a prefix ("4." of "4.5" decodes as 4),
+            # so read more and decode again.
+            after = end
+            while 0 <= after < len(buf) and buf[after] in _WHITESPACE:
+                after += 1
+            complete = end != -1 and after < len(buf) and buf[after] in ",]"
+            if not complete and not eof:
+                more = f.read(chunk_size)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+                continue
+            if end == -1 or (after < len(buf) and buf[after] not in ",]"):
+                return
+            yield item
+            pos = end
+
+
+@timed("coerce_result_to_json_text")
+def coerce_result(result_obj: Any, openers: Tuple[str, ...] = ("[", "{")) -> Any:
+    """Parsed JSON payload of a crew result (CrewOutput, string, list or dict); [] if none.
+
+    ``openers`` is passed to ``parse_json_output``.
+    """
     try:
         if isinstance(result_obj, (list, dict)):
-            return json.dumps(result_obj)
+            return result_obj
         if isinstance(result_obj, str):
-            return extract_json_text(result_obj)
+            return parse_json_output(result_obj, openers)
 
         # Common CrewOutput attributes
         for attr in ["raw", "raw_output", "output", "final_output", "json"]:
@@ -70,22 +155,25 @@ def coerce_result_to_json_text(result_obj: Any) -> str:
                     except Exception:
                         continue
                 if isinstance(value, (list, dict)):
-                    return json.dumps(value)
+                    return value
                 if isinstance(value, str):
-                    return extract_json_text(value)
+                    return parse_json_output(value, openers)
 
         # to_json method
         if hasattr(result_obj, "to_json") and callable(getattr(result_obj, "to_json")):
             try:
-                text = result_obj.to_json()
-                return extract_json_text(text)
+                return parse_json_output(result_obj.to_json(), openers)
             except Exception:
                 pass
 
         # Fallback: stringify and try
-        return extract_json_text(str(result_obj))
+        return parse_json_output(str(result_obj), openers)
     except Exception:
-        return "[]"
+        return []
+
+
+def coerce_result_to_json_text(result_obj: Any) -> str:
+    return json.dumps(coerce_result(result_obj))
 
 
 def _guess_name_from_filename(file_name: str) -> str:
@@ -103,16 +191,13 @@ def _guess_name_from_filename(file_name: str) -> str:
         return file_name
 
 
-def normalize_candidates_json(json_text: str) -> str:
-    try:
-        data = json.loads(json_text)
-    except Exception:
-        return "[]"
-
+@timed("normalize_candidates_json")
+def normalize_candidates(data: Any) -> List[dict]:
+    """Coerce parsed analysis output into the report's candidate records."""
     if not isinstance(data, list):
-        return "[]"
+        return []
 
-    normalized: list[dict] = []
+    normalized: List[dict] = []
     for item in data:
         if not isinstance(item, dict):
             continue
@@ -139,6 +224,12 @@ def normalize_candidates_json(json_text: str) -> str:
             "resource-file": file_name,
         })
 
-    return json.dumps(normalized)
+    return normalized
 
 
+def normalize_candidates_json(json_text: str) -> str:
+    try:
+        data = json.loads(json_text)
+    except Exception:
+        return "[]"
+    return json.dumps(normalize_candidates(data))
@@ -0,0 +1,129 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from rm_agent_helper.settings import env_int
+
+
+def retry_budget() -> int:
+    """Most resumes or jobs one repair pass may re-queue (RM_RETRY_BUDGET)."""
+    return env_int("RM_RETRY_BUDGET", 50, minimum=0)
+
+
+def retry_rounds() -> int:
+    """How many times an invalid item may be re-queued (RM_RETRY_ROUNDS)."""
+    return env_int("RM_RETRY_ROUNDS", 2, minimum=0)
+
+
+def candidate_problems(candidate: Any) -> List[str]:
+    """Why an analysed candidate is unusable; empty when it is valid."""
+    if not isinstance(candidate, dict):
+        return ["not an object"]
+    problems: List[str] = []
+    if not str(candidate.get("resource-file") or "").strip():
+        problems.append("missing resource-file")
+    name = candidate.get("resource-name")
+    if not isinstance(name, str) or not name.strip():
+        problems.append("empty resource-name")
+    title = candidate.get("resource-job-title")
+    if title is not None and not isinstance(title, str):
+        problems.append("resource-job-title is not a string")
+    expertise = candidate.get("experties")
+    if not isinstance(expertise, list) or not any(isinstance(e, str) and e.strip() for e in expertise):
+        problems.append("empty experties")
+    return problems
+
+
+def _percent_ok(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    try:
+        return 0 <= float(value) <= 100
+    except (TypeError, ValueError):
+        return False
+
+
+def job_match_problems(entry: Any, expected_files: Optional[Iterable[str]] = None) -> List[str]:
+    """Why a job-match entry is unusable; empty when it is valid.
+
+    With ``expected_files`` the entry must also score every one of those resumes.
+    """
+    if not isinstance(entry, dict):
+        return ["not an object"]
+    problems: List[str] = []
+    if not str(entry.get("job-file") or "").strip():
+        problems.append("missing job-file")
+    matches = entry.get("matches")
+    if not isinstance(matches, list):
+        return problems + ["matches is not a list"]
+    scored = set()
+    bad = 0
+    for match in matches:
+        if not isinstance(match, dict) or not match.get("resource-file") or not _percent_ok(match.get("percent")):
+            bad += 1
+            continue
+        scored.add(match["resource-file"])
+    if bad:
+        problems.append(f"{bad} invalid matches")
+    if expected_files is not None:
+        missing = [f for f in expected_files if f not in scored]
+        if missing:
+            problems.append(f"{len(missing)} resumes not scored")
+    return problems
+
+
+def invalid_candidates(candidates: Any, resource_files: List[str]) -> Dict[str, str]:
+    """{resource-file: reason} for resumes without a valid candidate, in ``resource_files`` order."""
+    valid = set()
+    reasons: Dict[str, str] = {}
+    for candidate in candidates if isinstance(candidates, list) else []:
+        problems = candidate_problems(candidate)
+        resource_file = candidate.get("resource-file") if isinstance(candidate, dict) else None
+        if not problems:
+            valid.add(resource_file)
+        elif resource_file:
+            reasons.setdefault(resource_file, ", ".join(problems))
+    return {f: reasons.get(f, "missing from output") for f in resource_files if f not in valid}
+
+
+def invalid_job_matches(
+    report: Any, expected: Dict[str, Optional[List[str]]]
+) -> Dict[str, str]:
+    """{job-file: reason} for jobs without a valid entry.
+
+    ``expected`` maps each job file to the resume files its entry must score (None to
+    only check the entry's shape).
+    """
+    entries = {}
+    for entry in report if isinstance(report, list) else []:
+        if isinstance(entry, dict) and entry.get("job-file"):
+            entries.setdefault(entry["job-file"], entry)
+    reasons: Dict[str, str] = {}
+    for job_file, files in expected.items():
+        if job_file not in entries:
+            reasons[job_file] = "missing from output"
+            continue
+        problems = job_match_problems(entries[job_file], files)
+        if problems:
+            reasons[job_file] = ", ".join(problems)
+    return reasons
+
+
+def merge_repairs(existing: Any, repairs: List[Dict[str, Any]], key: str, is_valid) -> List[Any]:
+    """Replace entries of ``existing`` with valid ``repairs`` that share their ``key``.
+
+    Repairs for keys not present are appended; an invalid repair only fills a gap and
+    never replaces an existing entry.
+    """
+    merged: List[Any] = list(existing) if isinstance(existing, list) else []
+    positions = {
+        item.get(key): i for i, item in enumerate(merged) if isinstance(item, dict) and item.get(key)
+    }
+    for repair in repairs:
+        if not isinstance(repair, dict) or not repair.get(key):
+            continue
+        position = positions.get(repair[key])
+        if position is None:
+            positions[repair[key]] = len(merged)
+            merged.append(repair)
+        elif is_valid(repair):
+            merged[position] = repair
+    return merged